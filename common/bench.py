@@ -0,0 +1,294 @@
+import os
+import csv
+import sys
+import time
+import random
+import argparse
+import platform
+import statistics
+import tracemalloc
+import multiprocessing
+from multiprocessing.connection import wait
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+from dimacs import iter_sources, parse_cnf
+from resultcache import CACHE_PATH, ResultCache
+from resultstore import STORE_PATH, ResultStore
+from solvers import SOLVER_PATHS, load_solver, parse_options, solve
+
+FIELDS = ['filename', 'solver', 'time_sec', 'peak_mem_kb', 'result', 'time_min', 'time_iqr', 'parse_sec',
+          'repeats', 'rss_kb', 'seed', 'python', 'host', 'cached']
+POLL_INTERVAL = 0.05
+PAGE_SIZE = os.sysconf('SC_PAGE_SIZE') if hasattr(os, 'sysconf') else 4096
+
+def _max_rss_kb() -> int:
+    if resource is None:
+        return 0
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak // 1024 if sys.platform == 'darwin' else peak
+
+def _rss_kb(pid: int) -> Optional[int]:
+    try:
+        with open(f'/proc/{pid}/statm') as f:
+            return int(f.read().split()[1]) * PAGE_SIZE // 1024
+    except (OSError, ValueError, IndexError):
+        return None
+
+def summarize(times: List[float]) -> Tuple[float, float, float]:
+    if len(times) < 2:
+        return times[0], times[0], 0.0
+    q1, _, q3 = statistics.quantiles(times, n=4, method='inclusive')
+    return statistics.median(times), min(times), q3 - q1
+
+def measure(solver: str, options: Dict[str, object], data: bytes, repeat: int = 1,
+            memory_pass: bool = True, seed: int = 0,
+            progress: Optional[Callable[[Dict[str, int]], None]] = None) -> Dict[str, object]:
+    load_solver(solver)
+    start = time.perf_counter()
+    cnf = parse_cnf(data, cache=False)
+    parse_sec = time.perf_counter() - start
+
+    counters = {}
+    random.seed(seed)
+    solve(solver, cnf, counters, progress, **options)
+
+    times = []
+    for _ in range(repeat):
+        random.seed(seed)
+        start = time.perf_counter()
+        result, model = solve(solver, cnf, **options)
+        times.append(time.perf_counter() - start)
+
+    peak_kb = None
+    if memory_pass:
+        random.seed(seed)
+        tracemalloc.start()
+        try:
+            solve(solver, cnf, **options)
+            peak_kb = tracemalloc.get_traced_memory()[1] // 1024
+        finally:
+            tracemalloc.stop()
+
+    return {'result': result, 'model': model, 'times': times, 'parse_sec': parse_sec,
+            'peak_kb': peak_kb, 'rss_kb': _max_rss_kb(), 'counters': counters}
+
+def progress_printer(label: str, interval: float) -> Callable[[Dict[str, int]], None]:
+    last = time.perf_counter()
+
+    def report(stats):
+        nonlocal last
+        now = time.perf_counter()
+        if now - last >= interval:
+            last = now
+            print(f"{label}: " + ', '.join(f"{key}={value}" for key, value in stats.items()), flush=True)
+    return report
+
+def _worker(conn, solver: str, options: Dict[str, object], data: bytes, mem_limit_kb: int,
+            repeat: int, memory_pass: bool, seed: int, filename: str = '', progress: Optional[float] = None) -> None:
+    if mem_limit_kb and resource is not None and not os.path.exists(f'/proc/{os.getpid()}/statm'):
+        limit = mem_limit_kb * 1024
+        resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+    try:
+        report = progress_printer(filename, progress) if progress is not None else None
+        conn.send(measure(solver, options, data, repeat, memory_pass, seed, report))
+    except MemoryError:
+        conn.send({'result': 'MEMOUT', 'rss_kb': _max_rss_kb()})
+    except Exception as e:
+        conn.send({'result': f'ERROR: {e}'})
+    finally:
+        conn.close()
+
+def _row(filename: str, solver: str, measured: Dict[str, object], seed: Optional[int] = None,
+         cached: bool = False) -> Dict[str, object]:
+    row = {
+        'filename': filename,
+        'solver': solver,
+        'time_sec': '',
+        'peak_mem_kb': '' if measured.get('peak_kb') is None else measured['peak_kb'],
+        'result': measured['result'],
+        'rss_kb': '' if measured.get('rss_kb') is None else measured['rss_kb'],
+        'seed': '' if seed is None else seed,
+        'python': platform.python_version(),
+        'host': platform.node(),
+        'cached': 'yes' if cached else 'no',
+    }
+    if measured.get('times'):
+        median, fastest, iqr = summarize(measured['times'])
+        row.update({'time_sec': f"{median:.4f}", 'time_min': f"{fastest:.4f}", 'time_iqr': f"{iqr:.4f}",
+                    'repeats': len(measured['times'])})
+    elif measured.get('elapsed') is not None:
+        row['time_sec'] = f"{measured['elapsed']:.4f}"
+    if measured.get('parse_sec') is not None:
+        row['parse_sec'] = f"{measured['parse_sec']:.4f}"
+    row.update(measured.get('counters') or {})
+    return row
+
+def run_benchmark(solver: str, sources: Iterable[Tuple[str, bytes]], jobs: int = 0,
+                  timeout: Optional[float] = None, mem_limit_mb: Optional[int] = None,
+                  options: Optional[Dict[str, object]] = None, verbose: bool = True,
+                  cache: Optional[ResultCache] = None, repeat: int = 1, memory_pass: bool = True,
+                  seed: Optional[int] = None, progress: Optional[float] = None,
+                  compile_cache: bool = True) -> List[Dict[str, object]]:
+    if solver not in SOLVER_PATHS:
+        raise ValueError(f"Unknown solver '{solver}'")
+    if repeat < 1:
+        raise ValueError(f"Need at least one timed pass, got repeat={repeat}")
+    jobs = jobs or os.cpu_count() or 1
+    options = options or {}
+    mem_limit_kb = mem_limit_mb * 1024 if mem_limit_mb else 0
+    if seed is None:
+        seed = random.SystemRandom().randrange(2 ** 32)
+    methods = multiprocessing.get_all_start_methods()
+    context = multiprocessing.get_context('fork' if 'fork' in methods else None)
+
+    sources = iter(sources)
+    rows: List[Optional[Dict[str, object]]] = []
+    running = {}
+    exhausted = False
+
+    def report(row):
+        if verbose:
+            cached = ' (cached)' if row['cached'] == 'yes' else ''
+            print(f"{row['filename']}: {row['result']} in {row['time_sec']}s, {row['peak_mem_kb']} KB peak memory{cached}")
+
+    def finish(conn, measured, kill=False):
+        index, filename, process, started, peak, digest = running.pop(conn)
+        if kill:
+            process.kill()
+        process.join()
+        conn.close()
+        row = _row(filename, solver, measured, seed)
+        rows[index] = row
+        if cache is not None and measured.get('times'):
+            cache.put(digest, solver, options, row['result'], measured.get('model'),
+                      float(row['time_sec']), measured.get('peak_kb'), measured.get('counters'), seed)
+        report(row)
+
+    while running or not exhausted:
+        while not exhausted and len(running) < jobs:
+            try:
+                filename, data = next(sources)
+            except StopIteration:
+                exhausted = True
+                break
+            digest = None
+            if cache is not None:
+                digest = parse_cnf(data, cache=compile_cache).fingerprint()
+                hit = cache.get(digest, solver, options, seed)
+                if hit is not None:
+                    measured = {'result': hit['verdict'], 'elapsed': hit['time_sec'], 'peak_kb': hit['peak_mem_kb'],
+                                'counters': hit['counters']}
+                    rows.append(_row(filename, solver, measured, hit['seed'], cached=True))
+                    report(rows[-1])
+                    continue
+            receiver, sender = context.Pipe(duplex=False)
+            process = context.Process(target=_worker, daemon=True,
+                                      args=(sender, solver, options, data, mem_limit_kb, repeat, memory_pass, seed,
+                                            filename, progress))
+            process.start()
+            sender.close()
+            running[receiver] = (len(rows), filename, process, time.perf_counter(), 0, digest)
+            rows.append(None)
+
+        for conn in wait(list(running), timeout=POLL_INTERVAL):
+            process, started, peak = running[conn][2:5]
+            try:
+                measured = conn.recv()
+            except EOFError:
+                process.join()
+                if process.exitcode is not None and process.exitcode < 0:
+                    result = 'MEMOUT' if mem_limit_kb and peak >= mem_limit_kb else f'ERROR: killed by signal {-process.exitcode}'
+                else:
+                    result = f'ERROR: exit code {process.exitcode}'
+                measured = {'result': result, 'rss_kb': peak}
+            if 'times' not in measured:
+                measured['elapsed'] = time.perf_counter() - started
+            finish(conn, measured)
+
+        now = time.perf_counter()
+        for conn in list(running):
+            index, filename, process, started, peak, digest = running[conn]
+            rss = _rss_kb(process.pid)
+            if rss is not None and rss > peak:
+                peak = rss
+                running[conn] = (index, filename, process, started, peak, digest)
+            if mem_limit_kb and peak > mem_limit_kb:
+                finish(conn, {'result': 'MEMOUT', 'elapsed': now - started, 'rss_kb': peak}, kill=True)
+            elif timeout is not None and now - started > timeout:
+                finish(conn, {'result': 'TIMEOUT', 'elapsed': now - started, 'rss_kb': peak}, kill=True)
+
+    return rows
+
+def counter_fields(rows: List[Dict[str, object]], fields: List[str] = FIELDS) -> List[str]:
+    extra = {key for row in rows for key in row if key not in fields}
+    return fields + sorted(extra)
+
+def write_results(rows: List[Dict[str, object]], output_csv: str, fields: Optional[List[str]] = None) -> None:
+    write_header = not os.path.exists(output_csv)
+    if not write_header:
+        with open(output_csv, newline='') as csvfile:
+            fields = next(csv.reader(csvfile), None) or fields
+    if fields is None:
+        fields = counter_fields(rows)
+    with open(output_csv, 'a', newline='') as csvfile:
+        writer = csv.DictWriter(csvfile, fieldnames=fields, extrasaction='ignore')
+        if write_header:
+            writer.writeheader()
+        writer.writerows(rows)
+
+def positive_int(value: str) -> int:
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"expected a positive integer, got {value}")
+    return number
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Run a SAT solver over a benchmark set in parallel.',
+                                     epilog='Each instance gets one untimed warm-up pass that also collects the search '
+                                            'counters, then --repeat identical timed passes. parse_sec is always an '
+                                            'uncached DIMACS parse.')
+    parser.add_argument('solver', choices=sorted(SOLVER_PATHS))
+    parser.add_argument('path', nargs='?', default='benchmarks', help='directory, .cnf file or tar archive')
+    parser.add_argument('-o', '--output', help='also append the results to this CSV file')
+    parser.add_argument('-j', '--jobs', type=int, default=0, help='worker processes (default: all cores)')
+    parser.add_argument('-t', '--timeout', type=float, help='wall-clock limit per instance (all passes) in seconds')
+    parser.add_argument('-m', '--mem-limit', type=int, help='RSS limit per instance in MB')
+    parser.add_argument('-O', '--option', action='append', metavar='KEY=VALUE', help='solver option, repeatable')
+    parser.add_argument('--cache', default=CACHE_PATH, help='result cache database')
+    parser.add_argument('--no-cache', action='store_true', help='solve every instance even if a cached result exists')
+    parser.add_argument('--store', default=STORE_PATH, help='results store database')
+    parser.add_argument('--no-store', action='store_true', help='do not record this run in the results store')
+    parser.add_argument('-r', '--repeat', type=positive_int, default=1, help='timed passes per instance after the warm-up')
+    parser.add_argument('--no-memory-pass', action='store_true', help='skip the separate tracemalloc pass')
+    parser.add_argument('--seed', type=int, help='seed for the random module before every pass (default: random, recorded)')
+    parser.add_argument('--progress', type=float, metavar='SECONDS',
+                        help='print live search counters from running solvers at most this often')
+    args = parser.parse_args(argv)
+
+    if not os.path.exists(args.path):
+        print(f"Path '{args.path}' does not exist.")
+        sys.exit(1)
+
+    options = parse_options(args.option)
+    cache = None if args.no_cache else ResultCache(args.cache)
+    try:
+        rows = run_benchmark(args.solver, iter_sources(args.path), args.jobs, args.timeout,
+                             args.mem_limit, options, cache=cache, repeat=args.repeat,
+                             memory_pass=not args.no_memory_pass, seed=args.seed, progress=args.progress)
+    finally:
+        if cache is not None:
+            cache.close()
+    if not args.no_store:
+        with ResultStore(args.store) as store:
+            run = store.add_run(args.solver, options, rows, os.path.abspath(args.path))
+        print(f"Recorded run {run} in {args.store}")
+    if args.output or args.no_store:
+        write_results(rows, args.output or f"{args.solver}_results.csv")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+from typing import Iterable, Iterator, List, Tuple
+
+Clause = Tuple[int, int]
+
+EMPTY: Clause = (0, 0)
+
+def from_literals(literals: Iterable[int]) -> Clause:
+    pos = neg = 0
+    for lit in literals:
+        if lit > 0:
+            pos |= 1 << lit
+        else:
+            neg |= 1 << -lit
+    return pos, neg
+
+def bits(mask: int) -> Iterator[int]:
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
+
+def to_literals(clause: Clause) -> List[int]:
+    pos, neg = clause
+    return [var for var in bits(pos)] + [-var for var in bits(neg)]
+
+def literal_bit(lit: int) -> Tuple[int, bool]:
+    return 1 << abs(lit), lit > 0
+
+def size(clause: Clause) -> int:
+    return clause[0].bit_count() + clause[1].bit_count()
+
+def variables(clause: Clause) -> int:
+    return clause[0] | clause[1]
+
+def max_var(clause: Clause) -> int:
+    return (clause[0] | clause[1]).bit_length() - 1
+
+def is_tautology(clause: Clause) -> bool:
+    return bool(clause[0] & clause[1])
+
+def contains(clause: Clause, lit: int) -> bool:
+    return bool(clause[0] >> lit & 1) if lit > 0 else bool(clause[1] >> -lit & 1)
+
+def without(clause: Clause, lit: int) -> Clause:
+    if lit > 0:
+        return clause[0] & ~(1 << lit), clause[1]
+    return clause[0], clause[1] & ~(1 << -lit)
+
+def clashing(a: Clause, b: Clause) -> int:
+    return (a[0] & b[1]) | (a[1] & b[0])
+
+def resolve(a: Clause, b: Clause, var: int) -> Clause:
+    mask = ~(1 << var)
+    return (a[0] | b[0]) & mask, (a[1] | b[1]) & mask
+
+def subsumes(a: Clause, b: Clause) -> bool:
+    return not (a[0] & ~b[0]) and not (a[1] & ~b[1])
@@ -0,0 +1,150 @@
+import os
+import sys
+import mmap
+import struct
+from array import array
+from typing import Iterator, List, Optional
+
+from dimacs import CNF
+
+try:
+    from multiprocessing import shared_memory
+except ImportError:
+    shared_memory = None
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+STORE_MAGIC = b'CSR' + sys.byteorder[0].encode()
+STORE_HEADER = struct.Struct('<4sIQQ')
+
+def _layout(num_vars: int, num_clauses: int, num_lits: int) -> List[int]:
+    sizes = [num_lits, num_clauses + 1, 2 * num_vars + 2, num_lits]
+    bounds = [STORE_HEADER.size]
+    for size in sizes:
+        bounds.append(bounds[-1] + 4 * size)
+    return bounds
+
+class ClauseStore(CNF):
+    def __init__(self, num_vars: int, literals, offsets, occ_offsets, occ_clauses,
+                 digest: str = '', buffer=None, shm=None, owner: Optional[int] = None):
+        super().__init__(num_vars, literals, offsets, digest, buffer)
+        self.occ_offsets = occ_offsets
+        self.occ_clauses = occ_clauses
+        self.shm = shm
+        self.owner = owner
+
+    @classmethod
+    def from_cnf(cls, cnf: CNF) -> 'ClauseStore':
+        num_vars = cnf.num_vars
+        literals = array('i', cnf.literals)
+        offsets = array('i', cnf.offsets)
+        counts = [0] * (2 * num_vars + 2)
+        for lit in literals:
+            counts[lit + num_vars + 1] += 1
+        for code in range(1, len(counts)):
+            counts[code] += counts[code - 1]
+        occ_offsets = array('i', counts)
+        fill = counts[:]
+        occ_clauses = array('i', bytes(4 * len(literals)))
+        for index in range(len(offsets) - 1):
+            for k in range(offsets[index], offsets[index + 1]):
+                code = literals[k] + num_vars
+                occ_clauses[fill[code]] = index
+                fill[code] += 1
+        return cls(num_vars, literals, offsets, occ_offsets, occ_clauses, cnf.digest)
+
+    @classmethod
+    def from_buffer(cls, buffer, digest: str = '', shm=None, owner: Optional[int] = None) -> 'ClauseStore':
+        magic, num_vars, num_clauses, num_lits = STORE_HEADER.unpack_from(buffer)
+        if magic != STORE_MAGIC:
+            raise ValueError('Not a clause store')
+        bounds = _layout(num_vars, num_clauses, num_lits)
+        view = memoryview(buffer)
+        literals, offsets, occ_offsets, occ_clauses = (view[bounds[i]:bounds[i + 1]].cast('i') for i in range(4))
+        return cls(num_vars, literals, offsets, occ_offsets, occ_clauses, digest, buffer, shm, owner)
+
+    def nbytes(self) -> int:
+        return _layout(self.num_vars, len(self), len(self.literals))[-1]
+
+    def write_into(self, buffer) -> None:
+        bounds = _layout(self.num_vars, len(self), len(self.literals))
+        STORE_HEADER.pack_into(buffer, 0, STORE_MAGIC, self.num_vars, len(self), len(self.literals))
+        view = memoryview(buffer)
+        for i, part in enumerate((self.literals, self.offsets, self.occ_offsets, self.occ_clauses)):
+            view[bounds[i]:bounds[i + 1]] = memoryview(part).cast('B')
+        view.release()
+
+    def share(self, name: Optional[str] = None) -> 'ClauseStore':
+        if shared_memory is None:
+            raise RuntimeError('multiprocessing.shared_memory is not available')
+        shm = shared_memory.SharedMemory(name=name, create=True, size=max(1, self.nbytes()))
+        self.write_into(shm.buf)
+        return ClauseStore.from_buffer(shm.buf, self.digest, shm, owner=os.getpid())
+
+    @classmethod
+    def attach(cls, name: str, digest: str = '') -> 'ClauseStore':
+        if shared_memory is None:
+            raise RuntimeError('multiprocessing.shared_memory is not available')
+        if sys.version_info >= (3, 13):
+            shm = shared_memory.SharedMemory(name=name, track=False)
+        else:
+            shm = shared_memory.SharedMemory(name=name)
+        return cls.from_buffer(shm.buf, digest, shm)
+
+    def save(self, path: str) -> None:
+        tmp = f"{path}.{os.getpid()}.tmp"
+        buffer = bytearray(self.nbytes())
+        self.write_into(buffer)
+        with open(tmp, 'wb') as f:
+            f.write(buffer)
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path: str, digest: str = '') -> 'ClauseStore':
+        with open(path, 'rb') as f:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        return cls.from_buffer(mapped, digest)
+
+    def __reduce__(self):
+        if self.shm is not None:
+            return ClauseStore.attach, (self.shm.name, self.digest)
+        return ClauseStore, (self.num_vars, array('i', self.literals), array('i', self.offsets),
+                             array('i', self.occ_offsets), array('i', self.occ_clauses), self.digest)
+
+    def clause(self, index: int):
+        return self.literals[self.offsets[index]:self.offsets[index + 1]]
+
+    def occurrences(self, lit: int):
+        code = lit + self.num_vars
+        return self.occ_clauses[self.occ_offsets[code]:self.occ_offsets[code + 1]]
+
+    def occurrence_lists(self) -> Iterator[List[int]]:
+        for code in range(2 * self.num_vars + 1):
+            yield self.occ_clauses[self.occ_offsets[code]:self.occ_offsets[code + 1]].tolist()
+
+    def as_numpy(self):
+        if np is None:
+            raise RuntimeError('as_numpy requires numpy')
+        return tuple(np.frombuffer(part, dtype=np.int32)
+                     for part in (self.literals, self.offsets, self.occ_offsets, self.occ_clauses))
+
+    def close(self) -> None:
+        for part in (self.literals, self.offsets, self.occ_offsets, self.occ_clauses):
+            if isinstance(part, memoryview):
+                part.release()
+        if self.shm is not None:
+            self.shm.close()
+            if self.owner == os.getpid():
+                self.shm.unlink()
+            self.shm = None
+        elif isinstance(self._buffer, mmap.mmap):
+            self._buffer.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
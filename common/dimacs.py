@@ -0,0 +1,181 @@
+import os
+import re
+import sys
+import gzip
+import mmap
+import struct
+import hashlib
+import tarfile
+from array import array
+from typing import Iterator, List, Optional, Tuple, Union
+
+CACHE_DIR = os.environ.get('SAT_CACHE_DIR', os.path.join(os.path.expanduser('~'), '.cache', 'satpaper', 'cnf'))
+CACHE_MAGIC = b'CNF' + sys.byteorder[0].encode()
+CACHE_HEADER = struct.Struct('<4sIQQ')
+CNF_SUFFIXES = ('.cnf', '.cnf.gz', '.dimacs', '.dimacs.gz')
+ARCHIVE_SUFFIXES = ('.tar', '.tar.gz', '.tgz', '.tar.bz2', '.tar.xz')
+
+_COMMENT_LINES = re.compile(rb'(?m)^[ \t]*[cp%].*$')
+_HEADER = re.compile(rb'(?m)^[ \t]*p[ \t]+cnf[ \t]+(\d+)[ \t]+(\d+)')
+
+class CNF:
+    def __init__(self, num_vars: int, literals, offsets, digest: str = '', buffer=None):
+        self.num_vars = num_vars
+        self.literals = literals
+        self.offsets = offsets
+        self.digest = digest
+        self._buffer = buffer
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def __iter__(self) -> Iterator[List[int]]:
+        literals, offsets = self.literals, self.offsets
+        for i in range(len(offsets) - 1):
+            yield literals[offsets[i]:offsets[i + 1]].tolist()
+
+    def clauses(self) -> List[List[int]]:
+        return list(self)
+
+    def fingerprint(self) -> str:
+        h = hashlib.sha256(str(self.num_vars).encode())
+        h.update(self.literals)
+        h.update(self.offsets)
+        return h.hexdigest()
+
+def _tokens_to_ints(body: bytes) -> array:
+    tokens = body.split()
+    try:
+        return array('i', map(int, tokens))
+    except ValueError:
+        return array('i', [int(t) for t in tokens if t.lstrip(b'-').isdigit()])
+
+def compile_cnf(data: bytes) -> CNF:
+    header = _HEADER.search(data)
+    num_vars = int(header.group(1)) if header else 0
+    values = _tokens_to_ints(_COMMENT_LINES.sub(b'', data))
+
+    literals = array('i')
+    offsets = array('i', [0])
+    start, size = 0, len(values)
+    while start < size:
+        try:
+            end = values.index(0, start)
+        except ValueError:
+            end = size
+        if end > start:
+            literals.extend(values[start:end])
+            offsets.append(len(literals))
+        start = end + 1
+    if literals:
+        num_vars = max(num_vars, max(literals), -min(literals))
+    return CNF(num_vars, literals, offsets)
+
+def from_clauses(clauses: List[List[int]], num_vars: int = 0) -> CNF:
+    literals = array('i')
+    offsets = array('i', [0])
+    for clause in clauses:
+        literals.extend(clause)
+        offsets.append(len(literals))
+    if literals:
+        num_vars = max(num_vars, max(literals), -min(literals))
+    return CNF(num_vars, literals, offsets)
+
+def format_dimacs(clauses: List[List[int]], num_vars: int) -> bytes:
+    lines = [f"p cnf {num_vars} {len(clauses)}"]
+    lines.extend(' '.join(map(str, clause + [0])) for clause in clauses)
+    return ('\n'.join(lines) + '\n').encode()
+
+def _cache_path(digest: str, cache_dir: str) -> str:
+    return os.path.join(cache_dir, digest[:2], digest + '.bin')
+
+def _read_cache(path: str, digest: str) -> Optional[CNF]:
+    try:
+        with open(path, 'rb') as f:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError):
+        return None
+    if len(mapped) < CACHE_HEADER.size:
+        return None
+    magic, num_vars, num_clauses, num_lits = CACHE_HEADER.unpack_from(mapped)
+    if magic != CACHE_MAGIC or len(mapped) != CACHE_HEADER.size + 4 * (num_lits + num_clauses + 1):
+        return None
+    view = memoryview(mapped)
+    split = CACHE_HEADER.size + 4 * num_lits
+    literals = view[CACHE_HEADER.size:split].cast('i')
+    offsets = view[split:].cast('i')
+    return CNF(num_vars, literals, offsets, digest, mapped)
+
+def _write_cache(path: str, cnf: CNF) -> None:
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp, 'wb') as f:
+            f.write(CACHE_HEADER.pack(CACHE_MAGIC, cnf.num_vars, len(cnf), len(cnf.literals)))
+            cnf.literals.tofile(f)
+            cnf.offsets.tofile(f)
+        os.replace(tmp, path)
+    except OSError:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+
+def parse_cnf(data: Union[bytes, str], cache: bool = True, cache_dir: str = CACHE_DIR) -> CNF:
+    if isinstance(data, str):
+        data = data.encode()
+    digest = hashlib.sha256(data).hexdigest()
+    if cache:
+        path = _cache_path(digest, cache_dir)
+        cnf = _read_cache(path, digest)
+        if cnf is not None:
+            return cnf
+    cnf = compile_cnf(data)
+    cnf.digest = digest
+    if cache:
+        _write_cache(path, cnf)
+    return cnf
+
+def read_source(path: str) -> bytes:
+    if path.endswith('.gz'):
+        with gzip.open(path, 'rb') as f:
+            return f.read()
+    with open(path, 'rb') as f:
+        return f.read()
+
+def load_cnf(path: str, cache: bool = True, cache_dir: str = CACHE_DIR) -> CNF:
+    return parse_cnf(read_source(path), cache, cache_dir)
+
+def parse_dimacs(path: str) -> Tuple[List[List[int]], int]:
+    cnf = load_cnf(path)
+    return cnf.clauses(), cnf.num_vars
+
+def is_cnf_name(name: str) -> bool:
+    return name.endswith(CNF_SUFFIXES)
+
+def is_archive_name(name: str) -> bool:
+    return name.endswith(ARCHIVE_SUFFIXES)
+
+def iter_archive(path: str) -> Iterator[Tuple[str, bytes]]:
+    with tarfile.open(path, 'r:*') as archive:
+        for member in archive:
+            name = os.path.basename(member.name)
+            if not member.isfile() or not is_cnf_name(name):
+                continue
+            data = archive.extractfile(member).read()
+            if name.endswith('.gz'):
+                data = gzip.decompress(data)
+            yield name, data
+
+def iter_sources(path: str) -> Iterator[Tuple[str, bytes]]:
+    if os.path.isdir(path):
+        for filename in sorted(os.listdir(path)):
+            filepath = os.path.join(path, filename)
+            if is_cnf_name(filename) or is_archive_name(filename):
+                yield from iter_sources(filepath)
+    elif is_archive_name(path):
+        yield from iter_archive(path)
+    else:
+        yield os.path.basename(path), read_source(path)
+
+def iter_formulas(path: str, cache: bool = True, cache_dir: str = CACHE_DIR) -> Iterator[Tuple[str, CNF]]:
+    for name, data in iter_sources(path):
+        yield name, parse_cnf(data, cache, cache_dir)
@@ -0,0 +1,72 @@
+import os
+import sys
+import random
+import argparse
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from dimacs import format_dimacs, from_clauses
+from solvers import solve
+
+THRESHOLD_RATIO = 4.26
+KEEP = ('sat', 'unsat')
+
+def clause_stream(num_vars: int, num_clauses: int, k: int, rng: random.Random,
+                  planted: Optional[Dict[int, bool]] = None) -> Iterator[List[int]]:
+    variables = range(1, num_vars + 1)
+    for _ in range(num_clauses):
+        while True:
+            clause = [var if rng.random() < 0.5 else -var for var in rng.sample(variables, k)]
+            if planted is None or any((lit > 0) == planted[abs(lit)] for lit in clause):
+                break
+        yield clause
+
+def random_ksat(num_vars: int, ratio: float = THRESHOLD_RATIO, k: int = 3, seed=None,
+                planted: bool = False) -> Tuple[List[List[int]], Optional[Dict[int, bool]]]:
+    if k > num_vars:
+        raise ValueError(f"Cannot draw {k} distinct variables out of {num_vars}")
+    rng = random.Random(seed)
+    hidden = {var: rng.random() < 0.5 for var in range(1, num_vars + 1)} if planted else None
+    return list(clause_stream(num_vars, round(ratio * num_vars), k, rng, hidden)), hidden
+
+def iter_instances(num_vars: int, count: int, ratio: float = THRESHOLD_RATIO, k: int = 3, seed: int = 0,
+                   planted: bool = False, keep: Optional[str] = None,
+                   max_attempts: Optional[int] = None) -> Iterator[Tuple[str, bytes]]:
+    if keep is not None and keep not in KEEP:
+        raise ValueError(f"Unknown filter '{keep}', expected one of {', '.join(KEEP)}")
+    max_attempts = max_attempts or 100 * count
+    prefix = 'prk' if planted else 'rk'
+    accepted = 0
+    for attempt in range(max_attempts):
+        if accepted >= count:
+            break
+        clauses, _ = random_ksat(num_vars, ratio, k, f"{seed}:{k}:{num_vars}:{ratio}:{attempt}", planted)
+        if keep is not None and solve('cdcl', from_clauses(clauses, num_vars))[0] != keep.upper():
+            continue
+        accepted += 1
+        header = f"c random {k}-SAT n={num_vars} ratio={ratio:g} seed={seed} index={attempt}{' planted' if planted else ''}\n"
+        yield f"{prefix}{k}-n{num_vars}-r{ratio:g}-s{seed}-{attempt}.cnf", header.encode() + format_dimacs(clauses, num_vars)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Generate seeded random k-SAT instances.')
+    parser.add_argument('-n', '--num-vars', type=int, required=True)
+    parser.add_argument('-c', '--count', type=int, default=1)
+    parser.add_argument('-r', '--ratio', type=float, default=THRESHOLD_RATIO, help='clauses per variable')
+    parser.add_argument('-k', type=int, default=3, help='literals per clause')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--planted', action='store_true', help='hide a solution so every instance is SAT')
+    parser.add_argument('--keep', choices=KEEP, help='only keep instances with this verdict (solved with cdcl)')
+    parser.add_argument('-o', '--output-dir', help='write .cnf files here instead of standard output')
+    args = parser.parse_args(argv)
+
+    instances = iter_instances(args.num_vars, args.count, args.ratio, args.k, args.seed, args.planted, args.keep)
+    if args.output_dir:
+        os.makedirs(args.output_dir, exist_ok=True)
+    for name, data in instances:
+        if args.output_dir:
+            with open(os.path.join(args.output_dir, name), 'wb') as f:
+                f.write(data)
+        else:
+            sys.stdout.buffer.write(data)
+
+if __name__ == "__main__":
+    main()
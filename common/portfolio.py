@@ -0,0 +1,117 @@
+import os
+import sys
+import time
+import argparse
+import multiprocessing
+from multiprocessing.connection import wait
+from typing import Dict, List, Optional, Tuple
+
+from bench import _max_rss_kb, write_results
+from clausestore import ClauseStore
+from dimacs import CNF, iter_formulas
+from resultstore import STORE_PATH, ResultStore
+from solvers import INCOMPLETE, SOLVER_PATHS, parse_options, solve
+
+FIELDS = ['filename', 'time_sec', 'rss_kb', 'result', 'winner', 'solvers']
+DEFAULT_PORTFOLIO = ['dpll:engine=trail,heuristic=vsids', 'walksat', 'dp:bound=0']
+
+def parse_spec(spec: str) -> Tuple[str, Dict[str, object]]:
+    name, _, options = spec.partition(':')
+    if name not in SOLVER_PATHS:
+        raise ValueError(f"Unknown solver '{name}'")
+    return name, parse_options(options.split(',') if options else [])
+
+def _race_worker(conn, name: str, options: Dict[str, object], cnf: CNF) -> None:
+    try:
+        start = time.perf_counter()
+        result, model = solve(name, cnf, **options)
+        conn.send((result, model, time.perf_counter() - start, _max_rss_kb()))
+    except Exception as e:
+        conn.send((f'ERROR: {e}', None, None, None))
+    finally:
+        conn.close()
+
+def is_definitive(name: str, result: str) -> bool:
+    if result == 'SAT':
+        return True
+    return result == 'UNSAT' and name not in INCOMPLETE
+
+def solve_portfolio(cnf: CNF, specs: List[str] = DEFAULT_PORTFOLIO,
+                    timeout: Optional[float] = None) -> Tuple[str, Optional[Dict[int, bool]], str, float, int]:
+    methods = multiprocessing.get_all_start_methods()
+    context = multiprocessing.get_context('fork' if 'fork' in methods else None)
+    start = time.perf_counter()
+    store = ClauseStore.from_cnf(cnf).share()
+    running = {}
+    for spec in specs:
+        name, options = parse_spec(spec)
+        receiver, sender = context.Pipe(duplex=False)
+        process = context.Process(target=_race_worker, args=(sender, name, options, store), daemon=True)
+        process.start()
+        sender.close()
+        running[receiver] = (spec, name, process)
+
+    verdict, model, winner, peak = 'UNKNOWN', None, '', 0
+    try:
+        while running:
+            remaining = None if timeout is None else timeout - (time.perf_counter() - start)
+            if remaining is not None and remaining <= 0:
+                verdict = 'TIMEOUT'
+                break
+            ready = wait(list(running), timeout=remaining)
+            for conn in ready:
+                spec, name, process = running.pop(conn)
+                try:
+                    result, found, _, rss = conn.recv()
+                except EOFError:
+                    result, found, rss = f'ERROR: {name} exited with code {process.exitcode}', None, None
+                conn.close()
+                process.join()
+                peak = max(peak, rss or 0)
+                if is_definitive(name, result):
+                    verdict, model, winner = result, found, spec
+                    return verdict, model, winner, time.perf_counter() - start, peak
+    finally:
+        for conn, (_, _, process) in running.items():
+            process.kill()
+            process.join()
+            conn.close()
+        store.close()
+    return verdict, model, winner, time.perf_counter() - start, peak
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Race several SAT solvers on each instance and keep the first definitive answer.')
+    parser.add_argument('path', nargs='?', default='benchmarks', help='directory, .cnf file or tar archive')
+    parser.add_argument('-s', '--solver', action='append', metavar='NAME[:KEY=VALUE,...]',
+                        help=f"portfolio member, repeatable (default: {' '.join(DEFAULT_PORTFOLIO)})")
+    parser.add_argument('-t', '--timeout', type=float, help='wall-clock limit per instance in seconds')
+    parser.add_argument('-o', '--output', default='portfolio_results.csv')
+    parser.add_argument('--store', default=STORE_PATH, help='results store database')
+    parser.add_argument('--no-store', action='store_true')
+    args = parser.parse_args(argv)
+
+    if not os.path.exists(args.path):
+        print(f"Path '{args.path}' does not exist.")
+        sys.exit(1)
+
+    specs = args.solver or DEFAULT_PORTFOLIO
+    rows = []
+    for filename, cnf in iter_formulas(args.path):
+        verdict, _, winner, elapsed, peak = solve_portfolio(cnf, specs, args.timeout)
+        rows.append({
+            'filename': filename,
+            'time_sec': f"{elapsed:.4f}",
+            'rss_kb': peak,
+            'result': verdict,
+            'winner': winner,
+            'solvers': ' '.join(specs),
+        })
+        print(f"{filename}: {verdict} by {winner or '-'} in {elapsed:.4f}s")
+    write_results(rows, args.output, FIELDS)
+    if not args.no_store:
+        with ResultStore(args.store) as store:
+            store.add_run('portfolio', {'solvers': ' '.join(specs)}, rows,
+                          os.path.abspath(args.path))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,318 @@
+import os
+import sys
+import time
+import argparse
+from collections import deque
+from typing import Dict, Iterable, List, Optional, Set, Tuple, Union
+
+import bitclause
+from dimacs import CNF, format_dimacs, from_clauses, iter_formulas
+
+STAGES = ('dedup', 'equiv', 'subsume', 'strengthen', 'probe')
+DEFAULT_STAGES = ('equiv', 'subsume', 'strengthen', 'probe')
+
+def parse_stages(spec: Union[str, int, bool, None]) -> Tuple[str, ...]:
+    if spec in (True, 1, 'all', 'default'):
+        return DEFAULT_STAGES
+    if not spec:
+        return ()
+    stages = tuple(str(spec).split('+'))
+    unknown = [stage for stage in stages if stage not in STAGES]
+    if unknown:
+        raise ValueError(f"Unknown preprocessing stage '{'+'.join(unknown)}', expected some of {'+'.join(STAGES)}")
+    return stages
+
+class Preprocessor:
+    def __init__(self, clauses: Iterable[List[int]], num_vars: int = 0, probe_limit: Optional[int] = None):
+        self.num_vars = num_vars
+        self.probe_limit = probe_limit
+        self.clauses: Dict[int, List[int]] = {}
+        self.bits: Dict[int, bitclause.Clause] = {}
+        self.ids: Dict[bitclause.Clause, int] = {}
+        self.occurrences: Dict[int, Set[int]] = {}
+        self.fixed: Dict[int, bool] = {}
+        self.substitutions: List[Tuple[int, int]] = []
+        self.units: List[int] = []
+        self.conflict = False
+        self.next_id = 0
+        self.report: List[Dict[str, object]] = []
+
+        start = time.perf_counter()
+        original = 0
+        variables = set()
+        for clause in clauses:
+            original += 1
+            variables.update(abs(lit) for lit in clause)
+            self.add(clause)
+        self.propagate()
+        if variables:
+            self.num_vars = max(self.num_vars, max(variables))
+        self.report.append({'stage': 'dedup', 'clauses_removed': original - len(self.clauses),
+                            'vars_removed': len(variables) - len(self.active_vars()),
+                            'seconds': time.perf_counter() - start})
+
+    def add(self, clause: Iterable[int]) -> Optional[int]:
+        literals = []
+        for lit in dict.fromkeys(clause):
+            value = self.fixed.get(abs(lit))
+            if value is None:
+                if -lit in literals:
+                    return None
+                literals.append(lit)
+            elif value == (lit > 0):
+                return None
+        if not literals:
+            self.conflict = True
+            return None
+        if len(literals) == 1:
+            self.units.append(literals[0])
+            return None
+        bits = bitclause.from_literals(literals)
+        if bits in self.ids:
+            return None
+        clause_id = self.next_id
+        self.next_id += 1
+        self.clauses[clause_id] = literals
+        self.bits[clause_id] = bits
+        self.ids[bits] = clause_id
+        for lit in literals:
+            self.occurrences.setdefault(lit, set()).add(clause_id)
+        return clause_id
+
+    def remove(self, clause_id: int) -> List[int]:
+        literals = self.clauses.pop(clause_id)
+        del self.ids[self.bits.pop(clause_id)]
+        for lit in literals:
+            self.occurrences[lit].discard(clause_id)
+        return literals
+
+    def occurring(self, lit: int) -> Set[int]:
+        return self.occurrences.get(lit, set())
+
+    def active_vars(self) -> Set[int]:
+        return {abs(lit) for lit, ids in self.occurrences.items() if ids}
+
+    def propagate(self) -> bool:
+        while self.units and not self.conflict:
+            lit = self.units.pop()
+            value = self.fixed.get(abs(lit))
+            if value is not None:
+                if value != (lit > 0):
+                    self.conflict = True
+                continue
+            self.fixed[abs(lit)] = lit > 0
+            for clause_id in list(self.occurring(lit)):
+                self.remove(clause_id)
+            for clause_id in list(self.occurring(-lit)):
+                self.add(self.remove(clause_id))
+        return not self.conflict
+
+    def subsume(self) -> None:
+        for clause_id in sorted(self.clauses, key=lambda i: len(self.clauses[i])):
+            if clause_id not in self.clauses:
+                continue
+            literals = self.clauses[clause_id]
+            bits = self.bits[clause_id]
+            rarest = min(literals, key=lambda lit: len(self.occurring(lit)))
+            for other in list(self.occurring(rarest)):
+                if other != clause_id and bitclause.subsumes(bits, self.bits[other]):
+                    self.remove(other)
+
+    def strengthen(self) -> None:
+        queue = deque(sorted(self.clauses, key=lambda i: len(self.clauses[i])))
+        while queue and not self.conflict:
+            clause_id = queue.popleft()
+            if clause_id not in self.clauses:
+                continue
+            bits = self.bits[clause_id]
+            for lit in self.clauses[clause_id]:
+                flipped = bitclause.without(bits, lit)
+                flipped = (flipped[0], flipped[1] | 1 << lit) if lit > 0 else (flipped[0] | 1 << -lit, flipped[1])
+                for other in list(self.occurring(-lit)):
+                    if bitclause.subsumes(flipped, self.bits[other]):
+                        strengthened = self.add([x for x in self.remove(other) if x != -lit])
+                        if strengthened is not None:
+                            queue.append(strengthened)
+            self.propagate()
+
+    def probe_literal(self, lit: int) -> Optional[Set[int]]:
+        implied = {lit}
+        queue = [lit]
+        while queue:
+            false_lit = -queue.pop()
+            for clause_id in self.occurring(false_lit):
+                unassigned = 0
+                for other in self.clauses[clause_id]:
+                    if other in implied:
+                        break
+                    if -other not in implied:
+                        if unassigned:
+                            break
+                        unassigned = other
+                else:
+                    if not unassigned:
+                        return None
+                    implied.add(unassigned)
+                    queue.append(unassigned)
+        return implied
+
+    def probe(self) -> None:
+        candidates = sorted(self.active_vars(), key=lambda v: -len(self.occurring(v)) - len(self.occurring(-v)))
+        for var in candidates[:self.probe_limit]:
+            if self.conflict:
+                return
+            if var in self.fixed:
+                continue
+            positive = self.probe_literal(var)
+            if positive is None:
+                self.units.append(-var)
+                self.propagate()
+                continue
+            negative = self.probe_literal(-var)
+            if negative is None:
+                self.units.append(var)
+                self.propagate()
+                continue
+            self.units.extend(positive & negative)
+            self.propagate()
+
+    def equiv(self) -> None:
+        graph: Dict[int, List[int]] = {}
+        for literals in self.clauses.values():
+            if len(literals) == 2:
+                a, b = literals
+                graph.setdefault(-a, []).append(b)
+                graph.setdefault(-b, []).append(a)
+
+        index: Dict[int, int] = {}
+        lowlink: Dict[int, int] = {}
+        stack: List[int] = []
+        on_stack: Set[int] = set()
+        mapping: Dict[int, int] = {}
+        for root in list(graph):
+            if root in index:
+                continue
+            work = [(root, 0)]
+            while work:
+                node, child = work.pop()
+                if child == 0:
+                    index[node] = lowlink[node] = len(index)
+                    stack.append(node)
+                    on_stack.add(node)
+                successors = graph.get(node, ())
+                if child < len(successors):
+                    work.append((node, child + 1))
+                    succ = successors[child]
+                    if succ not in index:
+                        work.append((succ, 0))
+                    elif succ in on_stack:
+                        lowlink[node] = min(lowlink[node], index[succ])
+                    continue
+                if work:
+                    parent = work[-1][0]
+                    lowlink[parent] = min(lowlink[parent], lowlink[node])
+                if lowlink[node] != index[node]:
+                    continue
+                component = []
+                while True:
+                    lit = stack.pop()
+                    on_stack.discard(lit)
+                    component.append(lit)
+                    if lit == node:
+                        break
+                if len(component) < 2:
+                    continue
+                members = set(component)
+                if any(-lit in members for lit in members):
+                    self.conflict = True
+                    return
+                representative = min(component, key=abs)
+                for lit in component:
+                    if lit != representative and abs(lit) not in mapping:
+                        mapping[abs(lit)] = representative if lit > 0 else -representative
+
+        if not mapping:
+            return
+        affected = set()
+        for var, representative in mapping.items():
+            self.substitutions.append((var, representative))
+            affected |= self.occurring(var) | self.occurring(-var)
+        for clause_id in affected:
+            literals = self.remove(clause_id)
+            self.add([(mapping[lit] if lit > 0 else -mapping[-lit]) if abs(lit) in mapping else lit
+                      for lit in literals])
+        self.propagate()
+
+    def run(self, stages: Iterable[str] = DEFAULT_STAGES) -> 'Preprocessor':
+        for stage in stages:
+            if self.conflict:
+                break
+            if stage not in STAGES:
+                raise ValueError(f"Unknown preprocessing stage '{stage}'")
+            if stage == 'dedup':
+                continue
+            start = time.perf_counter()
+            clauses, variables = len(self.clauses), len(self.active_vars())
+            getattr(self, stage)()
+            self.report.append({'stage': stage, 'clauses_removed': clauses - len(self.clauses),
+                                'vars_removed': variables - len(self.active_vars()),
+                                'seconds': time.perf_counter() - start})
+        return self
+
+    def simplified(self) -> List[List[int]]:
+        if self.conflict:
+            return [[]]
+        return [list(literals) for literals in self.clauses.values()]
+
+    def to_cnf(self) -> CNF:
+        return from_clauses(self.simplified(), self.num_vars)
+
+    def extend(self, model: Dict[int, bool]) -> Dict[int, bool]:
+        model = dict(model)
+        model.update(self.fixed)
+        substituted = {var for var, _ in self.substitutions}
+        for var in range(1, self.num_vars + 1):
+            if var not in substituted:
+                model.setdefault(var, False)
+        for var, representative in reversed(self.substitutions):
+            value = model[abs(representative)]
+            model[var] = value if representative > 0 else not value
+        return model
+
+    def summary(self) -> Dict[str, object]:
+        return {
+            'pre_clauses_removed': sum(entry['clauses_removed'] for entry in self.report),
+            'pre_vars_removed': sum(entry['vars_removed'] for entry in self.report),
+            'pre_sec': round(sum(entry['seconds'] for entry in self.report), 6),
+        }
+
+def preprocess(cnf: Union[CNF, List[List[int]]], num_vars: int = 0,
+               stages: Iterable[str] = DEFAULT_STAGES) -> Preprocessor:
+    return Preprocessor(cnf, getattr(cnf, 'num_vars', num_vars)).run(stages)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Simplify CNF formulas and report what each stage removed.')
+    parser.add_argument('path', nargs='?', default='benchmarks', help='directory, .cnf file or tar archive')
+    parser.add_argument('-s', '--stages', default='+'.join(DEFAULT_STAGES), help=f"stages joined by '+', from {'+'.join(STAGES)}")
+    parser.add_argument('-o', '--output-dir', help='write the simplified formulas here')
+    args = parser.parse_args(argv)
+
+    if not os.path.exists(args.path):
+        print(f"Path '{args.path}' does not exist.")
+        sys.exit(1)
+
+    stages = parse_stages(args.stages)
+    if args.output_dir:
+        os.makedirs(args.output_dir, exist_ok=True)
+    for filename, cnf in iter_formulas(args.path):
+        pre = preprocess(cnf, stages=stages)
+        status = 'UNSAT' if pre.conflict else f"{len(pre.clauses)} clauses, {len(pre.active_vars())} variables left"
+        print(f"{filename}: {len(cnf)} clauses, {cnf.num_vars} variables -> {status}")
+        for entry in pre.report:
+            print(f"  {entry['stage']:<10} -{entry['clauses_removed']} clauses  -{entry['vars_removed']} variables  {entry['seconds']:.4f}s")
+        if args.output_dir:
+            with open(os.path.join(args.output_dir, filename), 'wb') as f:
+                f.write(format_dimacs(pre.simplified(), pre.num_vars))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,190 @@
+import os
+import ast
+import json
+import time
+import sqlite3
+import hashlib
+import argparse
+from typing import Dict, Optional
+
+from solvers import RANDOMIZED, ROOT, SOLVER_PATHS
+
+CACHE_PATH = os.environ.get('SAT_RESULT_CACHE', os.path.join(os.path.expanduser('~'), '.cache', 'satpaper', 'results.sqlite'))
+CACHEABLE = ('SAT', 'UNSAT', 'UNKNOWN')
+
+COMMON = os.path.dirname(os.path.abspath(__file__))
+
+_versions = {}
+
+def _local_imports(source: bytes):
+    for node in ast.walk(ast.parse(source)):
+        if isinstance(node, ast.Import):
+            names = [alias.name for alias in node.names]
+        elif isinstance(node, ast.ImportFrom) and node.module and not node.level:
+            names = [node.module]
+        else:
+            continue
+        for name in names:
+            path = os.path.join(COMMON, name.split('.')[0] + '.py')
+            if os.path.exists(path):
+                yield path
+
+def solver_version(name: str) -> str:
+    if name not in _versions:
+        h = hashlib.sha256()
+        pending = [os.path.join(ROOT, SOLVER_PATHS[name]), os.path.join(COMMON, 'solvers.py')]
+        seen = set()
+        while pending:
+            path = pending.pop()
+            if path in seen:
+                continue
+            seen.add(path)
+            with open(path, 'rb') as f:
+                source = f.read()
+            pending.extend(_local_imports(source))
+        for path in sorted(seen):
+            with open(path, 'rb') as f:
+                h.update(os.path.basename(path).encode() + b'\0' + f.read())
+        _versions[name] = h.hexdigest()[:16]
+    return _versions[name]
+
+def config_string(options: Dict[str, object]) -> str:
+    return json.dumps(options or {}, sort_keys=True, separators=(',', ':'))
+
+class ResultCache:
+    def __init__(self, path: str = CACHE_PATH, max_entries: Optional[int] = None):
+        if path != ':memory:':
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.path = path
+        self.max_entries = max_entries
+        self.db = sqlite3.connect(path)
+        self.db.execute('''CREATE TABLE IF NOT EXISTS results (
+            key TEXT PRIMARY KEY,
+            digest TEXT NOT NULL,
+            solver TEXT NOT NULL,
+            version TEXT NOT NULL,
+            config TEXT NOT NULL,
+            verdict TEXT NOT NULL,
+            model TEXT,
+            time_sec REAL,
+            peak_mem_kb INTEGER,
+            counters TEXT,
+            seed INTEGER,
+            created REAL NOT NULL,
+            accessed REAL NOT NULL)''')
+        if 'seed' not in [column[1] for column in self.db.execute('PRAGMA table_info(results)')]:
+            self.db.execute('ALTER TABLE results ADD COLUMN seed INTEGER')
+        self.db.execute('CREATE INDEX IF NOT EXISTS results_solver ON results (solver)')
+        self.db.execute('CREATE INDEX IF NOT EXISTS results_accessed ON results (accessed)')
+        self.db.commit()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self) -> None:
+        self.db.close()
+
+    def key(self, digest: str, solver: str, options: Dict[str, object], seed: Optional[int] = None) -> str:
+        raw = f"{digest}|{solver}|{solver_version(solver)}|{config_string(options)}"
+        if solver in RANDOMIZED:
+            raw += f"|{seed}"
+        return hashlib.sha256(raw.encode()).hexdigest()
+
+    def get(self, digest: str, solver: str, options: Dict[str, object],
+            seed: Optional[int] = None) -> Optional[Dict[str, object]]:
+        key = self.key(digest, solver, options, seed)
+        row = self.db.execute(
+            'SELECT verdict, model, time_sec, peak_mem_kb, counters, seed FROM results WHERE key = ?',
+            (key,)).fetchone()
+        if row is None:
+            return None
+        self.db.execute('UPDATE results SET accessed = ? WHERE key = ?', (time.time(), key))
+        self.db.commit()
+        verdict, model, time_sec, peak_mem_kb, counters, seed = row
+        return {
+            'verdict': verdict,
+            'model': {int(var): value for var, value in json.loads(model).items()} if model else None,
+            'time_sec': time_sec,
+            'peak_mem_kb': peak_mem_kb,
+            'counters': json.loads(counters) if counters else {},
+            'seed': seed,
+        }
+
+    def put(self, digest: str, solver: str, options: Dict[str, object], verdict: str,
+            model: Optional[Dict[int, bool]] = None, time_sec: Optional[float] = None,
+            peak_mem_kb: Optional[int] = None, counters: Optional[Dict[str, object]] = None,
+            seed: Optional[int] = None) -> bool:
+        if verdict not in CACHEABLE:
+            return False
+        now = time.time()
+        self.db.execute(
+            '''INSERT OR REPLACE INTO results (key, digest, solver, version, config, verdict, model, time_sec,
+               peak_mem_kb, counters, seed, created, accessed) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)''',
+            (self.key(digest, solver, options, seed), digest, solver, solver_version(solver), config_string(options),
+             verdict, json.dumps(model) if model else None, time_sec, peak_mem_kb,
+             json.dumps(counters) if counters else None, seed, now, now))
+        self.db.commit()
+        if self.max_entries is not None:
+            self.evict(self.max_entries)
+        return True
+
+    def invalidate(self, solver: Optional[str] = None, digest: Optional[str] = None, stale: bool = False) -> int:
+        clauses, params = [], []
+        if solver is not None:
+            clauses.append('solver = ?')
+            params.append(solver)
+        if digest is not None:
+            clauses.append('digest = ?')
+            params.append(digest)
+        if stale:
+            current = [(name, solver_version(name)) for name in SOLVER_PATHS]
+            clauses.append('NOT (' + ' OR '.join('(solver = ? AND version = ?)' for _ in current) + ')')
+            params.extend(value for pair in current for value in pair)
+        where = ' WHERE ' + ' AND '.join(clauses) if clauses else ''
+        removed = self.db.execute('DELETE FROM results' + where, params).rowcount
+        self.db.commit()
+        return removed
+
+    def evict(self, max_entries: Optional[int] = None, older_than: Optional[float] = None) -> int:
+        removed = 0
+        if older_than is not None:
+            removed += self.db.execute('DELETE FROM results WHERE accessed < ?', (time.time() - older_than,)).rowcount
+        if max_entries is not None:
+            removed += self.db.execute(
+                'DELETE FROM results WHERE key NOT IN (SELECT key FROM results ORDER BY accessed DESC LIMIT ?)',
+                (max_entries,)).rowcount
+        self.db.commit()
+        return removed
+
+    def stats(self) -> Dict[str, int]:
+        return dict(self.db.execute('SELECT solver, COUNT(*) FROM results GROUP BY solver').fetchall())
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Inspect and maintain the solver result cache.')
+    parser.add_argument('--path', default=CACHE_PATH)
+    commands = parser.add_subparsers(dest='command', required=True)
+    commands.add_parser('stats', help='entries per solver')
+    invalidate = commands.add_parser('invalidate', help='drop cached results')
+    invalidate.add_argument('--solver', choices=sorted(SOLVER_PATHS))
+    invalidate.add_argument('--digest', help='normalized CNF fingerprint')
+    invalidate.add_argument('--stale', action='store_true', help='only results from older solver versions')
+    evict = commands.add_parser('evict', help='drop least recently used results')
+    evict.add_argument('--max-entries', type=int)
+    evict.add_argument('--older-than-days', type=float)
+    args = parser.parse_args(argv)
+
+    with ResultCache(args.path) as cache:
+        if args.command == 'stats':
+            for solver, count in sorted(cache.stats().items()):
+                print(f"{solver}: {count}")
+        elif args.command == 'invalidate':
+            print(f"Removed {cache.invalidate(args.solver, args.digest, args.stale)} entries")
+        else:
+            older_than = args.older_than_days * 86400 if args.older_than_days is not None else None
+            print(f"Removed {cache.evict(args.max_entries, older_than)} entries")
+
+if __name__ == "__main__":
+    main()
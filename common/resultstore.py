@@ -0,0 +1,251 @@
+import os
+import csv
+import sys
+import json
+import time
+import sqlite3
+import argparse
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from resultcache import config_string
+from solvers import INCOMPLETE, parse_options
+
+STORE_PATH = os.environ.get('SAT_RESULT_STORE', os.path.join(os.path.expanduser('~'), '.cache', 'satpaper', 'store.sqlite'))
+NUMERIC = ('time_sec', 'time_min', 'time_iqr', 'parse_sec', 'peak_mem_kb', 'rss_kb', 'repeats')
+RUN_FIELDS = ('seed', 'python', 'host')
+SOLVED = "(verdict = 'SAT' OR (verdict = 'UNSAT' AND solver NOT IN ({})))".format(
+    ', '.join(f"'{name}'" for name in sorted(INCOMPLETE)))
+QUANTILES = (0.25, 0.5, 0.75, 0.9)
+
+def split_spec(spec: str) -> Tuple[str, str]:
+    name, _, options = spec.partition(':')
+    return name, config_string(parse_options(options.split(',') if options else []))
+
+def spec_label(solver: str, config: str) -> str:
+    options = json.loads(config)
+    return solver + (':' + ','.join(f"{key}={value}" for key, value in options.items()) if options else '')
+
+def _number(value):
+    if value is None or value == '':
+        return None
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+def quantiles(stream: Iterable[float], count: int, qs: Sequence[float] = QUANTILES) -> List[Optional[float]]:
+    if not count:
+        return [None] * len(qs)
+    wanted = {}
+    for q in qs:
+        position = (count - 1) * q
+        wanted.setdefault(int(position), []).append(q)
+        wanted.setdefault(min(int(position) + 1, count - 1), [])
+    values = {}
+    for index, value in enumerate(stream):
+        if index in wanted:
+            values[index] = value
+        if index >= max(wanted):
+            break
+    result = []
+    for q in qs:
+        position = (count - 1) * q
+        low = int(position)
+        high = min(low + 1, count - 1)
+        result.append(values[low] + (values[high] - values[low]) * (position - low))
+    return result
+
+class ResultStore:
+    def __init__(self, path: str = STORE_PATH):
+        if path != ':memory:':
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.path = path
+        self.db = sqlite3.connect(path)
+        self.db.executescript('''
+            CREATE TABLE IF NOT EXISTS runs (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                solver TEXT NOT NULL,
+                config TEXT NOT NULL,
+                source TEXT,
+                seed INTEGER,
+                python TEXT,
+                host TEXT,
+                created REAL NOT NULL);
+            CREATE TABLE IF NOT EXISTS results (
+                run INTEGER NOT NULL REFERENCES runs (id) ON DELETE CASCADE,
+                instance TEXT NOT NULL,
+                solver TEXT NOT NULL,
+                config TEXT NOT NULL,
+                verdict TEXT NOT NULL,
+                time_sec REAL,
+                time_min REAL,
+                time_iqr REAL,
+                parse_sec REAL,
+                peak_mem_kb INTEGER,
+                rss_kb INTEGER,
+                repeats INTEGER,
+                cached INTEGER NOT NULL DEFAULT 0,
+                counters TEXT,
+                PRIMARY KEY (run, instance));
+            CREATE INDEX IF NOT EXISTS results_config ON results (solver, config, instance, run);
+            CREATE INDEX IF NOT EXISTS results_time ON results (solver, config, time_sec);
+            DROP VIEW IF EXISTS latest;
+            CREATE VIEW latest AS
+                SELECT results.* FROM results JOIN (
+                    SELECT solver, config, instance, COALESCE(MAX(CASE WHEN cached = 0 THEN run END), MAX(run)) AS run
+                    FROM results GROUP BY solver, config, instance
+                ) USING (solver, config, instance, run);''')
+        self.db.execute('PRAGMA foreign_keys = ON')
+        self.db.commit()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self) -> None:
+        self.db.close()
+
+    def begin_run(self, solver: str, options: Optional[Dict[str, object]] = None, source: str = '',
+                  seed: Optional[int] = None) -> int:
+        cursor = self.db.execute(
+            'INSERT INTO runs (solver, config, source, seed, created) VALUES (?, ?, ?, ?, ?)',
+            (solver, config_string(options), source, seed, time.time()))
+        self.db.commit()
+        return cursor.lastrowid
+
+    def record(self, run: int, rows: Iterable[Dict[str, object]]) -> int:
+        solver, config = self.db.execute('SELECT solver, config FROM runs WHERE id = ?', (run,)).fetchone()
+        records = []
+        meta = {}
+        for row in rows:
+            if row is None:
+                continue
+            counters = {key: value for key, value in row.items()
+                        if key not in NUMERIC + RUN_FIELDS + ('filename', 'solver', 'result', 'cached')
+                        and value not in ('', None)}
+            for key in RUN_FIELDS:
+                if row.get(key) not in ('', None):
+                    meta[key] = row[key]
+            records.append((run, row['filename'], solver, config, row['result'],
+                            *(_number(row.get(key)) for key in NUMERIC),
+                            1 if row.get('cached') in ('yes', True, 1) else 0,
+                            json.dumps(counters) if counters else None))
+        self.db.executemany('INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)', records)
+        if meta:
+            self.db.execute('UPDATE runs SET seed = COALESCE(seed, ?), python = ?, host = ? WHERE id = ?',
+                            (meta.get('seed'), meta.get('python'), meta.get('host'), run))
+        self.db.commit()
+        return len(records)
+
+    def add_run(self, solver: str, options: Optional[Dict[str, object]], rows: Iterable[Dict[str, object]],
+                source: str = '', seed: Optional[int] = None) -> int:
+        run = self.begin_run(solver, options, source, seed)
+        self.record(run, rows)
+        return run
+
+    def ingest_csv(self, path: str, solver: str, options: Optional[Dict[str, object]] = None) -> int:
+        with open(path, newline='') as csvfile:
+            return self.add_run(solver, options, csv.DictReader(csvfile), source=os.path.abspath(path))
+
+    def runs(self) -> List[Tuple]:
+        return self.db.execute('''SELECT runs.id, runs.solver, runs.config, runs.source, runs.created, COUNT(results.run)
+                                  FROM runs LEFT JOIN results ON results.run = runs.id
+                                  GROUP BY runs.id ORDER BY runs.id''').fetchall()
+
+    def configs(self) -> List[Tuple[str, str]]:
+        return self.db.execute('SELECT DISTINCT solver, config FROM results ORDER BY solver, config').fetchall()
+
+    def delete_run(self, run: int) -> int:
+        removed = self.db.execute('DELETE FROM results WHERE run = ?', (run,)).rowcount
+        self.db.execute('DELETE FROM runs WHERE id = ?', (run,))
+        self.db.commit()
+        return removed
+
+    def solved_times(self, solver: str, config: str) -> Iterator[float]:
+        cursor = self.db.execute(
+            f'SELECT time_sec FROM latest WHERE solver = ? AND config = ? AND time_sec IS NOT NULL AND {SOLVED} '
+            'ORDER BY time_sec', (solver, config))
+        for (time_sec,) in cursor:
+            yield time_sec
+
+    def summary(self, solver: str, config: str, qs: Sequence[float] = QUANTILES) -> Dict[str, object]:
+        instances, solved, peak, rss = self.db.execute(
+            f'''SELECT COUNT(*), SUM(CASE WHEN {SOLVED} AND time_sec IS NOT NULL THEN 1 ELSE 0 END), MAX(peak_mem_kb),
+                       MAX(rss_kb)
+                FROM latest WHERE solver = ? AND config = ?''', (solver, config)).fetchone()
+        solved = solved or 0
+        summary = {'solver': spec_label(solver, config), 'instances': instances, 'solved': solved, 'peak_mem_kb': peak,
+                   'rss_kb': rss}
+        for q, value in zip(qs, quantiles(self.solved_times(solver, config), solved, qs)):
+            summary[f"p{round(q * 100)}"] = value
+        return summary
+
+    def cactus(self, solver: str, config: str) -> Iterator[Tuple[int, float]]:
+        for rank, time_sec in enumerate(self.solved_times(solver, config), 1):
+            yield rank, time_sec
+
+    def head_to_head(self, first: Tuple[str, str], second: Tuple[str, str]) -> Iterator[Tuple]:
+        cursor = self.db.execute(
+            '''SELECT a.instance, a.time_sec, b.time_sec, a.verdict, b.verdict
+               FROM latest AS a JOIN latest AS b ON a.instance = b.instance
+               WHERE a.solver = ? AND a.config = ? AND b.solver = ? AND b.config = ?
+               ORDER BY a.instance''', (*first, *second))
+        yield from cursor
+
+    def export(self, output, solver: Optional[str] = None, config: Optional[str] = None) -> int:
+        clauses, params = [], []
+        if solver is not None:
+            clauses.append('solver = ?')
+            params.append(solver)
+        if config is not None:
+            clauses.append('config = ?')
+            params.append(config)
+        where = ' WHERE ' + ' AND '.join(clauses) if clauses else ''
+        cursor = self.db.execute('SELECT * FROM latest' + where + ' ORDER BY solver, config, instance', params)
+        writer = csv.writer(output)
+        writer.writerow([column[0] for column in cursor.description])
+        count = 0
+        for row in cursor:
+            writer.writerow(row)
+            count += 1
+        return count
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Inspect, import into and export from the results store.')
+    parser.add_argument('--path', default=STORE_PATH)
+    commands = parser.add_subparsers(dest='command', required=True)
+    commands.add_parser('runs', help='list recorded runs')
+    ingest = commands.add_parser('ingest', help='import result CSVs written by the solver scripts')
+    ingest.add_argument('solver', metavar='NAME[:KEY=VALUE,...]')
+    ingest.add_argument('csv', nargs='+')
+    export = commands.add_parser('export', help='write the latest result per instance as CSV')
+    export.add_argument('solver', nargs='?', metavar='NAME[:KEY=VALUE,...]')
+    export.add_argument('-o', '--output', help='CSV file (default: standard output)')
+    delete = commands.add_parser('delete', help='remove a run and its results')
+    delete.add_argument('run', type=int)
+    args = parser.parse_args(argv)
+
+    with ResultStore(args.path) as store:
+        if args.command == 'runs':
+            for run, solver, config, source, created, count in store.runs():
+                stamp = time.strftime('%Y-%m-%d %H:%M', time.localtime(created))
+                print(f"{run}: {spec_label(solver, config)} {count} results {stamp} {source or ''}")
+        elif args.command == 'ingest':
+            name, _, options = args.solver.partition(':')
+            for path in args.csv:
+                run = store.ingest_csv(path, name, parse_options(options.split(',') if options else []))
+                print(f"{path}: run {run}")
+        elif args.command == 'export':
+            solver, config = split_spec(args.solver) if args.solver else (None, None)
+            if args.output:
+                with open(args.output, 'w', newline='') as f:
+                    store.export(f, solver, config)
+            else:
+                store.export(sys.stdout, solver, config)
+        else:
+            print(f"Removed {store.delete_run(args.run)} results")
+
+if __name__ == "__main__":
+    main()
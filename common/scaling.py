@@ -0,0 +1,141 @@
+import sys
+import argparse
+import statistics
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from bench import run_benchmark, write_results
+from generator import KEEP, THRESHOLD_RATIO, iter_instances
+from portfolio import is_definitive, parse_spec
+from resultcache import CACHE_PATH, ResultCache
+from resultstore import STORE_PATH, ResultStore
+
+try:
+    import matplotlib
+    matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+except ImportError:
+    plt = None
+
+CURVE_FIELDS = ['solver', 'n', 'm', 'ratio', 'instances', 'solved', 'time_median', 'time_p90',
+                'mem_median_kb', 'mem_max_kb']
+DEFAULT_SIZES = [20, 50, 75, 100, 125, 150, 200, 250]
+DEFAULT_SOLVERS = ['cdcl', 'dpll:engine=trail,heuristic=vsids', 'walksat']
+
+def _percentile(values: List[float], q: int) -> float:
+    if len(values) < 2:
+        return values[0]
+    return statistics.quantiles(values, n=100, method='inclusive')[q - 1]
+
+def curve_point(spec: str, num_vars: int, ratio: float, rows: List[Dict[str, object]]) -> Dict[str, object]:
+    name, _ = parse_spec(spec)
+    solved = [row for row in rows if is_definitive(name, row['result'])]
+    times = [float(row['time_sec']) for row in solved]
+    memory = [int(row['peak_mem_kb']) for row in solved if row['peak_mem_kb'] != '']
+    return {
+        'solver': spec,
+        'n': num_vars,
+        'm': round(ratio * num_vars),
+        'ratio': ratio,
+        'instances': len(rows),
+        'solved': len(solved),
+        'time_median': f"{statistics.median(times):.4f}" if times else '',
+        'time_p90': f"{_percentile(times, 90):.4f}" if times else '',
+        'mem_median_kb': statistics.median(memory) if memory else '',
+        'mem_max_kb': max(memory) if memory else '',
+    }
+
+def scaling_suite(specs: Sequence[str], sizes: Sequence[int], count: int = 10, ratio: float = THRESHOLD_RATIO,
+                  k: int = 3, seed: int = 0, planted: bool = False, keep: Optional[str] = None, jobs: int = 0,
+                  timeout: Optional[float] = None, mem_limit_mb: Optional[int] = None,
+                  cache: Optional[ResultCache] = None, store: Optional[ResultStore] = None,
+                  verbose: bool = True) -> Tuple[List[Dict[str, object]], List[Dict[str, object]]]:
+    raw, curves = [], []
+    for spec in specs:
+        name, options = parse_spec(spec)
+        run = store.begin_run(name, options, f"scaling k={k} ratio={ratio:g} seed={seed}", seed) if store else None
+        for num_vars in sorted(sizes):
+            sources = iter_instances(num_vars, count, ratio, k, seed, planted, keep)
+            rows = run_benchmark(name, sources, jobs, timeout, mem_limit_mb, options, verbose=False,
+                                 cache=cache, seed=seed, compile_cache=False)
+            for row in rows:
+                row.update(solver=spec, n=num_vars, ratio=ratio)
+            if store is not None:
+                store.record(run, rows)
+            point = curve_point(spec, num_vars, ratio, rows)
+            raw.extend(rows)
+            curves.append(point)
+            if verbose:
+                print(f"{spec} n={num_vars}: {point['solved']}/{point['instances']} solved, "
+                      f"median {point['time_median'] or '-'}s, {point['mem_median_kb'] or '-'} KB")
+            if not point['solved']:
+                break
+    return raw, curves
+
+def plot_curves(curves: List[Dict[str, object]], prefix: str) -> List[str]:
+    if plt is None:
+        return []
+    written = []
+    for column, label, suffix in (('time_median', 'Median time (seconds)', 'time'),
+                                  ('mem_median_kb', 'Median peak memory (kB)', 'mem')):
+        plt.figure(figsize=(8, 5))
+        for spec in dict.fromkeys(point['solver'] for point in curves):
+            points = [(point['n'], float(point[column])) for point in curves
+                      if point['solver'] == spec and point[column] != '']
+            if points:
+                plt.plot(*zip(*points), marker='o', label=spec)
+        plt.yscale('log')
+        plt.xlabel('Variables (n)')
+        plt.ylabel(label)
+        plt.title(f"{label.split(' (')[0]} vs. n")
+        plt.legend()
+        plt.tight_layout()
+        path = f"{prefix}-{suffix}.png"
+        plt.savefig(path)
+        plt.close()
+        written.append(path)
+    return written
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Sweep random k-SAT instance size and record how each solver scales.')
+    parser.add_argument('-s', '--solver', action='append', metavar='NAME[:KEY=VALUE,...]',
+                        help=f"solver to sweep, repeatable (default: {' '.join(DEFAULT_SOLVERS)})")
+    parser.add_argument('--sizes', default=','.join(map(str, DEFAULT_SIZES)), help='comma-separated variable counts')
+    parser.add_argument('-c', '--count', type=int, default=10, help='instances per size')
+    parser.add_argument('-r', '--ratio', type=float, default=THRESHOLD_RATIO, help='clauses per variable')
+    parser.add_argument('-k', type=int, default=3, help='literals per clause')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--planted', action='store_true', help='only planted (satisfiable) instances')
+    parser.add_argument('--keep', choices=KEEP, help='only keep instances with this verdict')
+    parser.add_argument('-j', '--jobs', type=int, default=0, help='worker processes (default: all cores)')
+    parser.add_argument('-t', '--timeout', type=float, default=60.0, help='wall-clock limit per instance in seconds')
+    parser.add_argument('-m', '--mem-limit', type=int, help='RSS limit per instance in MB')
+    parser.add_argument('--cache', default=CACHE_PATH, help='result cache database')
+    parser.add_argument('--no-cache', action='store_true')
+    parser.add_argument('--store', default=STORE_PATH, help='results store database')
+    parser.add_argument('--no-store', action='store_true')
+    parser.add_argument('-o', '--output', default='scaling', help='prefix for the CSV files and plots')
+    args = parser.parse_args(argv)
+
+    try:
+        sizes = [int(size) for size in args.sizes.split(',')]
+    except ValueError:
+        print(f"Invalid sizes '{args.sizes}'")
+        sys.exit(1)
+
+    cache = None if args.no_cache else ResultCache(args.cache)
+    store = None if args.no_store else ResultStore(args.store)
+    try:
+        raw, curves = scaling_suite(args.solver or DEFAULT_SOLVERS, sizes, args.count, args.ratio, args.k, args.seed,
+                                    args.planted, args.keep, args.jobs, args.timeout, args.mem_limit, cache, store)
+    finally:
+        if cache is not None:
+            cache.close()
+        if store is not None:
+            store.close()
+    write_results(raw, f"{args.output}_results.csv")
+    write_results(curves, f"{args.output}_curves.csv", CURVE_FIELDS)
+    for path in plot_curves(curves, args.output):
+        print(f"Wrote {path}")
+
+if __name__ == "__main__":
+    main()
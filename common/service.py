@@ -0,0 +1,421 @@
+import os
+import json
+import time
+import signal
+import asyncio
+import hashlib
+import argparse
+import itertools
+import statistics
+import multiprocessing
+from collections import deque
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qsl, urlsplit
+
+from dimacs import parse_cnf
+from resultcache import CACHEABLE, config_string
+from solvers import SOLVER_PATHS, load_solver, parse_options, solve
+
+RESERVED = ('solver', 'deadline', 'wait', 'model')
+LATENCY_WINDOW = 1000
+MAX_BODY = 256 * 1024 * 1024
+REASONS = {200: 'OK', 202: 'Accepted', 400: 'Bad Request', 404: 'Not Found', 405: 'Method Not Allowed',
+           413: 'Payload Too Large', 503: 'Service Unavailable'}
+
+def _serve(conn) -> None:
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    for name in SOLVER_PATHS:
+        load_solver(name)
+    while True:
+        try:
+            job = conn.recv()
+        except EOFError:
+            break
+        if job is None:
+            break
+        job_id, name, options, data = job
+        start = time.perf_counter()
+        counters = {}
+        try:
+            result, model = solve(name, parse_cnf(data, cache=False), counters, **options)
+        except MemoryError:
+            result, model = 'MEMOUT', None
+        except Exception as e:
+            result, model = f'ERROR: {e}', None
+        if model is not None:
+            model = [var if value else -var for var, value in sorted(model.items())]
+        conn.send((job_id, result, model, time.perf_counter() - start, counters))
+    conn.close()
+
+class Job:
+    def __init__(self, job_id: int, key: str, solver: str, options: Dict[str, object], data: bytes,
+                 deadline: Optional[float] = None):
+        self.id = job_id
+        self.key = key
+        self.solver = solver
+        self.options = options
+        self.data = data
+        self.deadline = deadline
+        self.status = 'queued'
+        self.result: Optional[str] = None
+        self.model: Optional[List[int]] = None
+        self.counters: Dict[str, object] = {}
+        self.elapsed: Optional[float] = None
+        self.submitted = time.monotonic()
+        self.started: Optional[float] = None
+        self.finished: Optional[float] = None
+        self.requests = 1
+        self.done = asyncio.Event()
+        self.cancelled = asyncio.Event()
+
+    def remaining(self) -> Optional[float]:
+        return None if self.deadline is None else self.deadline - time.monotonic()
+
+    def view(self, model: bool = True) -> Dict[str, object]:
+        view = {'job': self.id, 'status': self.status, 'solver': self.solver, 'options': self.options,
+                'result': self.result, 'solve_sec': self.elapsed, 'requests': self.requests}
+        if self.started is not None:
+            view['queue_sec'] = round(self.started - self.submitted, 6)
+        if self.finished is not None:
+            view['latency_sec'] = round(self.finished - self.submitted, 6)
+        if self.counters:
+            view['counters'] = self.counters
+        if model and self.model is not None:
+            view['model'] = self.model
+        return view
+
+class Worker:
+    def __init__(self, context):
+        self.context = context
+        self.spawn()
+
+    def spawn(self) -> None:
+        self.conn, child = self.context.Pipe()
+        self.process = self.context.Process(target=_serve, args=(child,), daemon=True)
+        self.process.start()
+        child.close()
+
+    def kill(self) -> None:
+        self.conn.close()
+        self.process.kill()
+        self.process.join()
+
+    def restart(self) -> None:
+        self.kill()
+        self.spawn()
+
+    def stop(self) -> None:
+        try:
+            self.conn.send(None)
+        except OSError:
+            pass
+        self.process.join(1)
+        if self.process.is_alive():
+            self.process.kill()
+            self.process.join()
+        self.conn.close()
+
+    async def run(self, job: Job) -> Optional[Tuple]:
+        loop = asyncio.get_running_loop()
+        reply = loop.create_future()
+
+        def readable():
+            if reply.done():
+                return
+            try:
+                reply.set_result(self.conn.recv())
+            except (EOFError, OSError) as e:
+                reply.set_exception(e)
+
+        self.conn.send((job.id, job.solver, job.options, job.data))
+        loop.add_reader(self.conn.fileno(), readable)
+        cancelled = asyncio.ensure_future(job.cancelled.wait())
+        try:
+            while True:
+                await asyncio.wait({reply, cancelled}, timeout=job.remaining(), return_when=asyncio.FIRST_COMPLETED)
+                if reply.done():
+                    return reply.result()
+                if cancelled.done() or (job.remaining() is not None and job.remaining() <= 0):
+                    return None
+        finally:
+            cancelled.cancel()
+            loop.remove_reader(self.conn.fileno())
+
+class SolveService:
+    def __init__(self, workers: int = 0, max_queue: int = 0, keep: int = 10000,
+                 default_deadline: Optional[float] = None):
+        self.size = workers or os.cpu_count() or 1
+        self.max_queue = max_queue
+        self.keep = keep
+        self.default_deadline = default_deadline
+        methods = multiprocessing.get_all_start_methods()
+        self.context = multiprocessing.get_context('forkserver' if 'forkserver' in methods else 'spawn')
+        self.jobs: Dict[int, Job] = {}
+        self.active: Dict[str, Job] = {}
+        self.finished: Dict[str, Job] = {}
+        self.history = deque()
+        self.ids = itertools.count(1)
+        self.queue: Optional[asyncio.Queue] = None
+        self.workers: List[Worker] = []
+        self.tasks: List[asyncio.Task] = []
+        self.latencies = deque(maxlen=LATENCY_WINDOW)
+        self.waits = deque(maxlen=LATENCY_WINDOW)
+        self.counts = {'submitted': 0, 'deduplicated': 0, 'completed': 0, 'cancelled': 0, 'timeouts': 0,
+                       'errors': 0, 'rejected': 0, 'restarts': 0}
+        self.started = time.monotonic()
+
+    async def start(self) -> None:
+        self.queue = asyncio.Queue()
+        loop = asyncio.get_running_loop()
+        self.workers = await loop.run_in_executor(None, lambda: [Worker(self.context) for _ in range(self.size)])
+        self.tasks = [asyncio.ensure_future(self._dispatch(worker)) for worker in self.workers]
+
+    async def stop(self) -> None:
+        for task in self.tasks:
+            task.cancel()
+        await asyncio.gather(*self.tasks, return_exceptions=True)
+        for worker in self.workers:
+            worker.stop()
+
+    def queued(self) -> int:
+        return sum(1 for job in self.active.values() if job.status == 'queued')
+
+    def submit(self, solver: str, options: Dict[str, object], data: bytes,
+               deadline: Optional[float] = None) -> Job:
+        if solver not in SOLVER_PATHS:
+            raise ValueError(f"Unknown solver '{solver}', expected one of {', '.join(SOLVER_PATHS)}")
+        deadline = self.default_deadline if deadline is None else deadline
+        expires = None if deadline is None else time.monotonic() + deadline
+        key = hashlib.sha256(f"{solver}|{config_string(options)}|".encode() + data).hexdigest()
+        self.counts['submitted'] += 1
+
+        job = self.active.get(key) or self.finished.get(key)
+        if job is not None:
+            self.counts['deduplicated'] += 1
+            job.requests += 1
+            if not job.done.is_set() and job.deadline is not None:
+                job.deadline = None if expires is None else max(job.deadline, expires)
+            return job
+
+        if self.max_queue and self.queued() >= self.max_queue:
+            self.counts['rejected'] += 1
+            raise OverflowError(f"Queue is full ({self.max_queue} jobs)")
+        job = Job(next(self.ids), key, solver, options, data, expires)
+        self.jobs[job.id] = job
+        self.active[key] = job
+        self.queue.put_nowait(job)
+        if expires is not None:
+            asyncio.get_running_loop().call_later(deadline, self._expire, job)
+        return job
+
+    def _expire(self, job: Job) -> None:
+        if job.status != 'queued':
+            return
+        remaining = job.remaining()
+        if remaining is None or remaining > 0:
+            if remaining is not None:
+                asyncio.get_running_loop().call_later(remaining, self._expire, job)
+            return
+        self._finish(job, 'TIMEOUT')
+
+    def cancel(self, job: Job) -> bool:
+        if job.done.is_set():
+            return False
+        job.cancelled.set()
+        if job.status == 'queued':
+            self._finish(job, 'CANCELLED')
+        return True
+
+    def _finish(self, job: Job, result: str, model: Optional[List[int]] = None, elapsed: Optional[float] = None,
+                counters: Optional[Dict[str, object]] = None) -> None:
+        job.status = 'cancelled' if result == 'CANCELLED' else 'done'
+        job.result, job.model, job.elapsed = result, model, elapsed
+        job.counters = counters or {}
+        job.finished = time.monotonic()
+        job.data = b''
+        self.active.pop(job.key, None)
+        if result == 'CANCELLED':
+            self.counts['cancelled'] += 1
+        elif result == 'TIMEOUT':
+            self.counts['timeouts'] += 1
+        elif result.startswith('ERROR') or result == 'MEMOUT':
+            self.counts['errors'] += 1
+        else:
+            self.counts['completed'] += 1
+            self.latencies.append(job.finished - job.submitted)
+        if result in CACHEABLE:
+            self.finished[job.key] = job
+        self.history.append(job)
+        while len(self.history) > self.keep:
+            evicted = self.history.popleft()
+            self.jobs.pop(evicted.id, None)
+            if self.finished.get(evicted.key) is evicted:
+                del self.finished[evicted.key]
+        job.done.set()
+
+    async def _dispatch(self, worker: Worker) -> None:
+        while True:
+            job = await self.queue.get()
+            if job.status != 'queued':
+                continue
+            if job.remaining() is not None and job.remaining() <= 0:
+                self._finish(job, 'TIMEOUT')
+                continue
+            job.status = 'running'
+            job.started = time.monotonic()
+            self.waits.append(job.started - job.submitted)
+            try:
+                reply = await worker.run(job)
+            except (EOFError, OSError) as e:
+                reply = (job.id, f'ERROR: worker exited ({e or worker.process.exitcode})', None, None, {})
+                self.counts['restarts'] += 1
+                await asyncio.get_running_loop().run_in_executor(None, worker.restart)
+            if reply is None:
+                self.counts['restarts'] += 1
+                await asyncio.get_running_loop().run_in_executor(None, worker.restart)
+                self._finish(job, 'CANCELLED' if job.cancelled.is_set() else 'TIMEOUT',
+                             elapsed=time.monotonic() - job.started)
+            else:
+                _, result, model, elapsed, counters = reply
+                self._finish(job, result, model, elapsed, counters)
+
+    def metrics(self) -> Dict[str, object]:
+        metrics = {
+            'uptime_sec': round(time.monotonic() - self.started, 3),
+            'workers': self.size,
+            'queue_depth': self.queued(),
+            'running': sum(1 for job in self.active.values() if job.status == 'running'),
+            'retained': len(self.finished),
+        }
+        metrics.update(self.counts)
+        for name, samples in (('latency', self.latencies), ('queue_wait', self.waits)):
+            values = list(samples)
+            if len(values) >= 2:
+                cuts = statistics.quantiles(values, n=100, method='inclusive')
+                metrics.update({f'{name}_p50': cuts[49], f'{name}_p90': cuts[89], f'{name}_p99': cuts[98]})
+            elif values:
+                metrics.update({f'{name}_p50': values[0], f'{name}_p90': values[0], f'{name}_p99': values[0]})
+        return metrics
+
+async def _read_request(reader: asyncio.StreamReader) -> Optional[Tuple[str, str, Dict[str, str], bytes]]:
+    line = await reader.readline()
+    if not line.strip():
+        return None
+    method, target, *_ = line.decode('latin-1').split()
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if not line.strip():
+            break
+        name, _, value = line.decode('latin-1').partition(':')
+        headers[name.strip().lower()] = value.strip()
+    length = int(headers.get('content-length', 0))
+    if length > MAX_BODY:
+        raise OverflowError(f"Body of {length} bytes is too large")
+    body = await reader.readexactly(length) if length else b''
+    return method.upper(), target, headers, body
+
+def _respond(writer: asyncio.StreamWriter, status: int, payload: Dict[str, object], keep_alive: bool) -> None:
+    body = json.dumps(payload).encode() + b'\n'
+    head = (f"HTTP/1.1 {status} {REASONS[status]}\r\nContent-Type: application/json\r\n"
+            f"Content-Length: {len(body)}\r\nConnection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n")
+    writer.write(head.encode() + body)
+
+async def _route(service: SolveService, method: str, target: str, body: bytes) -> Tuple[int, Dict[str, object]]:
+    url = urlsplit(target)
+    query = dict(parse_qsl(url.query))
+    wait = query.get('wait', '1') not in ('0', 'false', 'no')
+    with_model = query.get('model', '1') not in ('0', 'false', 'no')
+    parts = [part for part in url.path.split('/') if part]
+
+    if parts == ['metrics'] and method == 'GET':
+        return 200, service.metrics()
+    if parts == ['solve']:
+        if method != 'POST':
+            return 405, {'error': 'Use POST with a DIMACS body'}
+        options = parse_options(f"{key}={value}" for key, value in query.items() if key not in RESERVED)
+        try:
+            deadline = float(query['deadline']) if 'deadline' in query else None
+            job = service.submit(query.get('solver', 'cdcl'), options, body, deadline)
+        except OverflowError as e:
+            return 503, {'error': str(e)}
+        except ValueError as e:
+            return 400, {'error': str(e)}
+    elif len(parts) == 2 and parts[0] == 'jobs' and parts[1].isdigit():
+        job = service.jobs.get(int(parts[1]))
+        if job is None:
+            return 404, {'error': f"No job {parts[1]}"}
+        if method == 'DELETE':
+            service.cancel(job)
+            wait = True
+        elif method != 'GET':
+            return 405, {'error': 'Use GET or DELETE'}
+    else:
+        return 404, {'error': f"No route for {method} {url.path}"}
+
+    if wait:
+        await job.done.wait()
+    return (200 if job.done.is_set() else 202), job.view(with_model)
+
+async def _handle(service: SolveService, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+    try:
+        while True:
+            try:
+                request = await _read_request(reader)
+            except OverflowError as e:
+                _respond(writer, 413, {'error': str(e)}, False)
+                break
+            except (ValueError, asyncio.IncompleteReadError):
+                break
+            if request is None:
+                break
+            method, target, headers, body = request
+            keep_alive = headers.get('connection', '').lower() != 'close'
+            status, payload = await _route(service, method, target, body)
+            _respond(writer, status, payload, keep_alive)
+            await writer.drain()
+            if not keep_alive:
+                break
+    except ConnectionError:
+        pass
+    finally:
+        writer.close()
+
+async def serve(service: SolveService, host: str = '127.0.0.1', port: int = 8765, unix: Optional[str] = None) -> None:
+    await service.start()
+    handler = lambda reader, writer: _handle(service, reader, writer)
+    if unix:
+        server = await asyncio.start_unix_server(handler, path=unix)
+    else:
+        server = await asyncio.start_server(handler, host, port)
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop.set)
+    where = unix or ', '.join(f"{sock.getsockname()[0]}:{sock.getsockname()[1]}" for sock in server.sockets)
+    print(f"Serving {service.size} warm workers on {where}", flush=True)
+    try:
+        await stop.wait()
+    finally:
+        server.close()
+        await server.wait_closed()
+        await service.stop()
+        if unix and os.path.exists(unix):
+            os.unlink(unix)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Serve SAT solves over HTTP from a pool of warm solver processes.')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('-p', '--port', type=int, default=8765)
+    parser.add_argument('--unix', metavar='PATH', help='listen on a Unix socket instead of TCP')
+    parser.add_argument('-j', '--jobs', type=int, default=0, help='solver processes (default: all cores)')
+    parser.add_argument('--max-queue', type=int, default=0, help='reject new jobs beyond this many queued (default: no limit)')
+    parser.add_argument('--keep', type=int, default=10000, help='finished jobs kept for lookup and deduplication')
+    parser.add_argument('-t', '--deadline', type=float, help='default per-job deadline in seconds')
+    args = parser.parse_args(argv)
+
+    service = SolveService(args.jobs, args.max_queue, args.keep, args.deadline)
+    asyncio.run(serve(service, args.host, args.port, args.unix))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,155 @@
+import os
+import sys
+import importlib.util
+from typing import Callable, Dict, Optional, Tuple
+
+from dimacs import CNF
+from preprocess import Preprocessor, parse_stages
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SOLVER_PATHS = {
+    'dpll': os.path.join('test-dpll', 'dpll.py'),
+    'cdcl': os.path.join('test-cdcl', 'cdcl.py'),
+    'walksat': os.path.join('test-walksat', 'walksat.py'),
+    'dp': os.path.join('tests-dp', 'dp.py'),
+    'res': os.path.join('tests-res', 'res.py'),
+}
+
+INCOMPLETE = {'walksat'}
+RANDOMIZED = {'walksat'}
+
+_modules = {}
+
+def load_solver(name: str):
+    if name not in SOLVER_PATHS:
+        raise ValueError(f"Unknown solver '{name}', expected one of {', '.join(SOLVER_PATHS)}")
+    if name not in _modules:
+        path = os.path.join(ROOT, SOLVER_PATHS[name])
+        spec = importlib.util.spec_from_file_location(f"{name}_solver", path)
+        module = importlib.util.module_from_spec(spec)
+        sys.modules[spec.name] = module
+        spec.loader.exec_module(module)
+        _modules[name] = module
+    return _modules[name]
+
+def parse_options(pairs) -> Dict[str, object]:
+    options = {}
+    for pair in pairs or ():
+        key, _, value = pair.partition('=')
+        for convert in (int, float):
+            try:
+                value = convert(value)
+                break
+            except ValueError:
+                continue
+        options[key] = value
+    return options
+
+def parse_bool(value) -> bool:
+    if isinstance(value, bool):
+        return value
+    text = str(value).lower()
+    if text in ('1', 'true', 'yes', 'on'):
+        return True
+    if text in ('0', 'false', 'no', 'off'):
+        return False
+    raise ValueError(f"Expected a boolean, got '{value}'")
+
+def _verdict(model) -> str:
+    return 'UNSAT' if model is None else 'SAT'
+
+COUNTING_MODES = ('enumerate', 'count')
+
+def _solve_dpll(module, cnf: CNF, stats=None, progress=None, engine: str = 'recursive', heuristic: str = 'first',
+                mode: str = 'solve', cache_literals: int = 1000000, depth: Optional[int] = None, jobs: int = 0):
+    if mode == 'cubes':
+        model, rows, summary = module.cube_and_conquer(cnf.clauses(), cnf.num_vars, depth, jobs,
+                                                        heuristic if heuristic != 'first' else 'vsids')
+        if stats is not None:
+            stats.update(summary, split_sec=round(summary['split_sec'], 6),
+                         cube_sec_max=round(max((row['time_sec'] for row in rows), default=0.0), 6),
+                         cube_sec_sum=round(sum(row['time_sec'] for row in rows), 6),
+                         decisions=sum(row['decisions'] for row in rows),
+                         conflicts=sum(row['conflicts'] for row in rows))
+        return _verdict(model), model
+    if mode == 'count':
+        counter = module.ModelCounter(cache_literals)
+        models = counter.count(cnf.clauses(), cnf.num_vars)
+        if stats is not None:
+            stats.update(counter.stats(), models=models)
+        return ('SAT' if models else 'UNSAT'), None
+    if mode == 'enumerate':
+        solver = module.TrailSolver(cnf.clauses(), cnf.num_vars, heuristic)
+        solver.set_progress(progress)
+        models, cubes = module.count_by_enumeration(solver, cnf.num_vars)
+        if stats is not None:
+            stats.update(solver.stats(), models=models, cubes=cubes)
+        return ('SAT' if models else 'UNSAT'), None
+    if mode != 'solve':
+        raise ValueError(f"Unknown dpll mode '{mode}', expected solve, cubes, {' or '.join(COUNTING_MODES)}")
+    if engine == 'trail':
+        solver = module.TrailSolver(cnf.clauses(), cnf.num_vars, heuristic)
+        solver.set_progress(progress)
+        model = solver.solve()
+        if stats is not None:
+            stats.update(solver.stats())
+    else:
+        model = module.dpll(cnf.clauses(), {}, cnf.num_vars, stats)
+    return _verdict(model), model
+
+def _solve_cdcl(module, cnf: CNF, stats=None, progress=None):
+    solver = module.CDCLSolver(cnf.clauses(), cnf.num_vars)
+    solver.set_progress(progress)
+    model = solver.solve()
+    if stats is not None:
+        stats.update(solver.stats())
+    return _verdict(model), model
+
+def _solve_walksat(module, cnf: CNF, stats=None, progress=None, max_flips: int = 10000, p: float = 0.5,
+                   algorithm: str = 'walksat', seed: Optional[int] = None, restart: str = 'none',
+                   restart_base: int = 1000, adaptive: bool = False, distribution: str = 'poly',
+                   cb: Optional[float] = None, eps: float = 1.0, wp: float = 0.01, tabu: int = 0):
+    assignment, result = module.walksat(cnf.clauses(), cnf.num_vars, max_flips, p, stats, progress,
+                                        algorithm=algorithm, seed=seed, restart=restart, restart_base=restart_base,
+                                        adaptive=parse_bool(adaptive), distribution=distribution, cb=cb, eps=eps, wp=wp,
+                                        tabu=tabu)
+    model = None
+    if assignment is not None:
+        model = {var: value for var, value in enumerate(assignment, 1)}
+    return result, model
+
+def _solve_dp(module, cnf: CNF, stats=None, progress=None, bound=0):
+    bound = None if bound in (None, 'none') else int(bound)
+    model = module.davis_putnam(cnf, bound=bound, stats=stats, progress=progress)
+    return _verdict(model), model
+
+def _solve_res(module, cnf: CNF, stats=None, progress=None, strategy: str = 'unit'):
+    return ('UNSAT' if module.saturate(cnf, strategy, stats, progress) is False else 'SAT'), None
+
+ADAPTERS = {
+    'dpll': _solve_dpll,
+    'cdcl': _solve_cdcl,
+    'walksat': _solve_walksat,
+    'dp': _solve_dp,
+    'res': _solve_res,
+}
+
+def solve(name: str, cnf: CNF, stats: Optional[Dict[str, int]] = None,
+          progress: Optional[Callable[[Dict[str, int]], None]] = None, preprocess=None,
+          **options) -> Tuple[str, Optional[Dict[int, bool]]]:
+    module = load_solver(name)
+    stages = parse_stages(preprocess)
+    if stages and options.get('mode') in COUNTING_MODES:
+        raise ValueError("Preprocessing does not preserve model counts")
+    if not stages:
+        return ADAPTERS[name](module, cnf, stats, progress, **options)
+    simplifier = Preprocessor(cnf, cnf.num_vars).run(stages)
+    if stats is not None:
+        stats.update(simplifier.summary())
+    if simplifier.conflict:
+        return 'UNSAT', None
+    result, model = ADAPTERS[name](module, simplifier.to_cnf(), stats, progress, **options)
+    if model is not None:
+        model = simplifier.extend(model)
+    return result, model
@@ -1,33 +1,100 @@
-import pandas as pd
-import matplotlib.pyplot as plt
-import seaborn as sns
+import os
+import sys
+import argparse
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'common'))
+from resultstore import QUANTILES, STORE_PATH, ResultStore, spec_label, split_spec
 
-df = pd.read_csv("walksat_results.csv")
+try:
+    import matplotlib
+    matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+except ImportError:
+    plt = None
 
 
-plt.figure(figsize=(10, 4))
-sns.lineplot(x=df.index, y="time_sec", data=df, color="blue")
-plt.title("Execution Time per File")
-plt.xlabel("File Index")
-plt.ylabel("Time (seconds)")
-plt.tight_layout()
-plt.show()
+def print_summary(store, configs):
+    columns = ['instances', 'solved'] + [f"p{round(q * 100)}" for q in QUANTILES] + ['peak_mem_kb', 'rss_kb']
+    width = max([len(spec_label(*config)) for config in configs] + [6])
+    print(f"{'solver':<{width}}  " + '  '.join(f"{column:>11}" for column in columns))
+    for config in configs:
+        summary = store.summary(*config)
+        cells = []
+        for column in columns:
+            value = summary[column]
+            if value is None:
+                cells.append(f"{'-':>11}")
+            elif isinstance(value, float):
+                cells.append(f"{value:>11.4f}")
+            else:
+                cells.append(f"{value:>11}")
+        print(f"{summary['solver']:<{width}}  " + '  '.join(cells))
 
 
-plt.figure(figsize=(10, 4))
-sns.lineplot(x=df.index, y="peak_mem_kb", data=df, color="green")
-plt.title("Peak Memory Usage per File")
-plt.xlabel("File Index")
-plt.ylabel("Memory (kB)")
-plt.tight_layout()
-plt.show()
+def plot_cactus(store, configs, path):
+    plt.figure(figsize=(8, 5))
+    for config in configs:
+        points = list(store.cactus(*config))
+        if points:
+            plt.step(*zip(*points), where='post', label=spec_label(*config))
+    plt.yscale('log')
+    plt.title("Instances Solved within Time")
+    plt.xlabel("Instances solved")
+    plt.ylabel("Time (seconds)")
+    plt.legend()
+    plt.tight_layout()
+    plt.savefig(path)
+    plt.close()
 
 
-plt.figure(figsize=(8, 6))
-sns.scatterplot(x="peak_mem_kb", y="time_sec", data=df, alpha=0.6, color="purple")
-plt.title("Execution Time vs. Peak Memory Usage")
-plt.xlabel("Peak Memory (kB)")
-plt.ylabel("Time (seconds)")
-plt.tight_layout()
-plt.show()
+def plot_scatter(store, first, second, path):
+    solved, unsolved = [], []
+    limit = 0.0
+    for _, time_a, time_b, verdict_a, verdict_b in store.head_to_head(first, second):
+        if time_a is None or time_b is None:
+            continue
+        limit = max(limit, time_a, time_b)
+        definitive = verdict_a in ('SAT', 'UNSAT') and verdict_b in ('SAT', 'UNSAT')
+        (solved if definitive else unsolved).append((max(time_a, 1e-4), max(time_b, 1e-4)))
+    plt.figure(figsize=(6, 6))
+    for points, color, label in ((solved, 'purple', 'both decided'), (unsolved, 'gray', 'undecided by one')):
+        if points:
+            plt.scatter(*zip(*points), alpha=0.6, color=color, label=label)
+    plt.plot([1e-4, max(limit, 1e-3)], [1e-4, max(limit, 1e-3)], color='black', linewidth=0.8)
+    plt.xscale('log')
+    plt.yscale('log')
+    plt.title("Head-to-Head Time per Instance")
+    plt.xlabel(f"{spec_label(*first)} (seconds)")
+    plt.ylabel(f"{spec_label(*second)} (seconds)")
+    plt.legend()
+    plt.tight_layout()
+    plt.savefig(path)
+    plt.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Summarize and plot solver results from the results store.')
+    parser.add_argument('-s', '--solver', action='append', metavar='NAME[:KEY=VALUE,...]',
+                        help='configuration to include, repeatable (default: every configuration in the store)')
+    parser.add_argument('--store', default=STORE_PATH, help='results store database')
+    parser.add_argument('-o', '--output', default='results', help='prefix for the plot files')
+    parser.add_argument('--no-plots', action='store_true')
+    args = parser.parse_args(argv)
+
+    with ResultStore(args.store) as store:
+        configs = [split_spec(spec) for spec in args.solver] if args.solver else store.configs()
+        if not configs:
+            print(f"No results in {args.store}")
+            sys.exit(1)
+        print_summary(store, configs)
+        if args.no_plots or plt is None:
+            return
+        plot_cactus(store, configs, f"{args.output}-cactus.png")
+        print(f"Wrote {args.output}-cactus.png")
+        if len(configs) >= 2:
+            plot_scatter(store, configs[0], configs[1], f"{args.output}-scatter.png")
+            print(f"Wrote {args.output}-scatter.png")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,430 @@
+import sys
+import os
+import csv
+import time
+import heapq
+import tracemalloc
+from typing import Callable, List, Dict, Optional, Tuple
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'common'))
+from dimacs import iter_sources, parse_cnf, parse_dimacs
+
+def luby(y: float, x: int) -> float:
+    size, seq = 1, 0
+    while size < x + 1:
+        seq += 1
+        size = 2 * size + 1
+    while size - 1 != x:
+        size = (size - 1) >> 1
+        seq -= 1
+        x = x % size
+    return y ** seq
+
+class CDCLSolver:
+    def __init__(self, clauses: List[List[int]], num_vars: int,
+                 restart_base: int = 100, var_decay: float = 0.95,
+                 first_reduce: int = 2000, reduce_increment: int = 300):
+        self.num_vars = 0
+        self.ok = True
+        self.values: List[int] = [0]
+        self.watches: List[List[List[int]]] = [[]]
+        self.level: List[int] = [0]
+        self.reason: List[Optional[List[int]]] = [None]
+        self.activity: List[float] = [0.0]
+        self.polarity: List[bool] = [False]
+        self.seen: List[bool] = [False]
+        self.order: List[Tuple[float, int]] = []
+        self.trail: List[int] = []
+        self.trail_lim: List[int] = []
+        self.qhead = 0
+        self.learnts: List[List[int]] = []
+        self.lbd: Dict[int, int] = {}
+        self.var_inc = 1.0
+        self.var_decay = var_decay
+        self.restart_base = restart_base
+        self.first_reduce = first_reduce
+        self.reduce_increment = reduce_increment
+        self.next_reduce = first_reduce
+        self.reductions = 0
+        self.conflicts = 0
+        self.decisions = 0
+        self.propagations = 0
+        self.restarts = 0
+        self.max_depth = 0
+        self.assumptions: List[int] = []
+        self.core: List[int] = []
+        self.progress: Optional[Callable[[Dict[str, int]], None]] = None
+        self.progress_every = 0
+        self.next_progress = -1
+        self.ensure_vars(max([num_vars] + [abs(lit) for clause in clauses for lit in clause]))
+        for clause in clauses:
+            self.add_clause(clause)
+
+    def ensure_vars(self, num_vars: int) -> None:
+        if num_vars <= self.num_vars:
+            return
+        grow = num_vars - self.num_vars
+        self.values = [0] * grow + self.values + [0] * grow
+        self.watches = [[] for _ in range(grow)] + self.watches + [[] for _ in range(grow)]
+        for var in range(self.num_vars + 1, num_vars + 1):
+            self.level.append(0)
+            self.reason.append(None)
+            self.activity.append(0.0)
+            self.polarity.append(False)
+            self.seen.append(False)
+            heapq.heappush(self.order, (0.0, var))
+        self.num_vars = num_vars
+
+    def value(self, lit: int) -> int:
+        return self.values[self.num_vars + lit]
+
+    def decision_level(self) -> int:
+        return len(self.trail_lim)
+
+    def stats(self) -> Dict[str, int]:
+        return {'decisions': self.decisions, 'propagations': self.propagations,
+                'conflicts': self.conflicts, 'max_depth': self.max_depth,
+                'restarts': self.restarts, 'learnts': len(self.learnts), 'reductions': self.reductions}
+
+    def set_progress(self, callback: Optional[Callable[[Dict[str, int]], None]], every: int = 1000) -> None:
+        self.progress = callback
+        self.progress_every = every
+        self.next_progress = self.conflicts + every if callback is not None else -1
+
+    def add_clause(self, clause: List[int]) -> bool:
+        if not self.ok:
+            return False
+        self.cancel_until(0)
+        self.ensure_vars(max([0] + [abs(lit) for lit in clause]))
+        literals = []
+        for lit in dict.fromkeys(clause):
+            value = self.value(lit)
+            if value == 1 or -lit in literals:
+                return True
+            if value == 0:
+                literals.append(lit)
+        if not literals:
+            self.ok = False
+        elif len(literals) == 1:
+            self.assign(literals[0], None)
+        else:
+            self.attach(literals)
+        return self.ok
+
+    def attach(self, clause: List[int]) -> None:
+        self.watches[self.num_vars + clause[0]].append(clause)
+        self.watches[self.num_vars + clause[1]].append(clause)
+
+    def assign(self, lit: int, reason: Optional[List[int]]) -> None:
+        n = self.num_vars
+        var = abs(lit)
+        self.values[n + lit] = 1
+        self.values[n - lit] = -1
+        self.level[var] = len(self.trail_lim)
+        self.reason[var] = reason
+        self.trail.append(lit)
+
+    def propagate(self) -> Optional[List[int]]:
+        n = self.num_vars
+        values = self.values
+        watches = self.watches
+        trail = self.trail
+        while self.qhead < len(trail):
+            false_lit = -trail[self.qhead]
+            self.qhead += 1
+            self.propagations += 1
+            watching = watches[n + false_lit]
+            i = j = 0
+            while i < len(watching):
+                clause = watching[i]
+                i += 1
+                if clause[0] == false_lit:
+                    clause[0], clause[1] = clause[1], false_lit
+                first = clause[0]
+                if values[n + first] == 1:
+                    watching[j] = clause
+                    j += 1
+                    continue
+                for k in range(2, len(clause)):
+                    lit = clause[k]
+                    if values[n + lit] != -1:
+                        clause[1], clause[k] = lit, false_lit
+                        watches[n + lit].append(clause)
+                        break
+                else:
+                    watching[j] = clause
+                    j += 1
+                    if values[n + first] == -1:
+                        while i < len(watching):
+                            watching[j] = watching[i]
+                            i += 1
+                            j += 1
+                        del watching[j:]
+                        return clause
+                    self.assign(first, clause)
+            del watching[j:]
+        return None
+
+    def cancel_until(self, level: int) -> None:
+        if len(self.trail_lim) <= level:
+            return
+        n = self.num_vars
+        start = self.trail_lim[level]
+        for lit in self.trail[start:]:
+            var = abs(lit)
+            self.values[n + lit] = 0
+            self.values[n - lit] = 0
+            self.reason[var] = None
+            self.polarity[var] = lit > 0
+            heapq.heappush(self.order, (-self.activity[var], var))
+        del self.trail[start:]
+        del self.trail_lim[level:]
+        self.qhead = len(self.trail)
+
+    def bump(self, var: int) -> None:
+        self.activity[var] += self.var_inc
+        if self.activity[var] > 1e100:
+            for v in range(1, self.num_vars + 1):
+                self.activity[v] *= 1e-100
+            self.var_inc *= 1e-100
+            self.order = [(-self.activity[v], v) for v in range(1, self.num_vars + 1)
+                          if self.values[self.num_vars + v] == 0]
+            heapq.heapify(self.order)
+        elif self.values[self.num_vars + var] == 0:
+            heapq.heappush(self.order, (-self.activity[var], var))
+
+    def pick_branch_literal(self) -> Optional[int]:
+        n = self.num_vars
+        order = self.order
+        if len(order) > 8 * n + 64:
+            self.order = order = [(-self.activity[v], v) for v in range(1, n + 1)
+                                  if self.values[n + v] == 0]
+            heapq.heapify(order)
+        while order:
+            _, var = heapq.heappop(order)
+            if self.values[n + var] == 0:
+                return var if self.polarity[var] else -var
+        return None
+
+    def analyze(self, conflict: List[int]) -> Tuple[List[int], int, int]:
+        seen = self.seen
+        level = self.level
+        trail = self.trail
+        current = self.decision_level()
+        learnt = [0]
+        counter = 0
+        lit = 0
+        index = len(trail) - 1
+        clause = conflict
+        while True:
+            for q in clause[1:] if lit else clause:
+                var = abs(q)
+                if not seen[var] and level[var] > 0:
+                    seen[var] = True
+                    self.bump(var)
+                    if level[var] >= current:
+                        counter += 1
+                    else:
+                        learnt.append(q)
+            while not seen[abs(trail[index])]:
+                index -= 1
+            lit = trail[index]
+            index -= 1
+            seen[abs(lit)] = False
+            counter -= 1
+            if counter == 0:
+                break
+            clause = self.reason[abs(lit)]
+        learnt[0] = -lit
+
+        minimized = [learnt[0]]
+        for q in learnt[1:]:
+            reason = self.reason[abs(q)]
+            if reason is None or any(not seen[abs(r)] and level[abs(r)] > 0 for r in reason[1:]):
+                minimized.append(q)
+        for q in learnt[1:]:
+            seen[abs(q)] = False
+        learnt = minimized
+
+        backjump = 0
+        if len(learnt) > 1:
+            best = 1
+            for k in range(2, len(learnt)):
+                if level[abs(learnt[k])] > level[abs(learnt[best])]:
+                    best = k
+            learnt[1], learnt[best] = learnt[best], learnt[1]
+            backjump = level[abs(learnt[1])]
+        lbd = len({level[abs(q)] for q in learnt})
+        return learnt, backjump, lbd
+
+    def analyze_final(self, lit: int) -> List[int]:
+        core = [-lit]
+        if self.level[abs(lit)] == 0:
+            return core
+        seen = self.seen
+        seen[abs(lit)] = True
+        for q in reversed(self.trail[self.trail_lim[0]:]):
+            var = abs(q)
+            if not seen[var]:
+                continue
+            reason = self.reason[var]
+            if reason is None:
+                core.append(q)
+            else:
+                for r in reason[1:]:
+                    if self.level[abs(r)] > 0:
+                        seen[abs(r)] = True
+            seen[var] = False
+        return core
+
+    def reduce_db(self) -> None:
+        locked = set()
+        for lit in self.trail:
+            reason = self.reason[abs(lit)]
+            if reason is not None:
+                locked.add(id(reason))
+        lbd = self.lbd
+        candidates = [c for c in self.learnts if lbd[id(c)] > 2 and id(c) not in locked]
+        candidates.sort(key=lambda c: lbd[id(c)], reverse=True)
+        removed = {id(c) for c in candidates[:len(candidates) // 2]}
+        if not removed:
+            return
+        self.learnts = [c for c in self.learnts if id(c) not in removed]
+        for key in removed:
+            del lbd[key]
+        for k, watching in enumerate(self.watches):
+            if watching:
+                self.watches[k] = [c for c in watching if id(c) not in removed]
+
+    def search(self, budget: int) -> Optional[bool]:
+        conflicts = 0
+        while True:
+            conflict = self.propagate()
+            if conflict is not None:
+                conflicts += 1
+                self.conflicts += 1
+                if self.conflicts == self.next_progress:
+                    self.next_progress += self.progress_every
+                    self.progress(self.stats())
+                if self.decision_level() == 0:
+                    return False
+                learnt, backjump, lbd = self.analyze(conflict)
+                self.cancel_until(backjump)
+                if len(learnt) == 1:
+                    self.assign(learnt[0], None)
+                else:
+                    self.attach(learnt)
+                    self.learnts.append(learnt)
+                    self.lbd[id(learnt)] = lbd
+                    self.assign(learnt[0], learnt)
+                self.var_inc /= self.var_decay
+                continue
+
+            if conflicts >= budget:
+                self.cancel_until(0)
+                return None
+            if self.conflicts >= self.next_reduce:
+                self.reductions += 1
+                self.next_reduce = self.conflicts + self.first_reduce + self.reduce_increment * self.reductions
+                self.reduce_db()
+            lit = None
+            while self.decision_level() < len(self.assumptions):
+                assumption = self.assumptions[self.decision_level()]
+                value = self.value(assumption)
+                if value == 1:
+                    self.trail_lim.append(len(self.trail))
+                elif value == -1:
+                    self.core = self.analyze_final(-assumption)
+                    return False
+                else:
+                    lit = assumption
+                    break
+            if lit is None:
+                lit = self.pick_branch_literal()
+                if lit is None:
+                    return True
+                self.decisions += 1
+            self.trail_lim.append(len(self.trail))
+            if len(self.trail_lim) > self.max_depth:
+                self.max_depth = len(self.trail_lim)
+            self.assign(lit, None)
+
+    def model(self) -> Dict[int, bool]:
+        return {abs(lit): lit > 0 for lit in self.trail}
+
+    def solve(self, assumptions: Optional[List[int]] = None) -> Optional[Dict[int, bool]]:
+        self.core = []
+        if not self.ok:
+            return None
+        self.cancel_until(0)
+        self.assumptions = list(assumptions or [])
+        self.ensure_vars(max([0] + [abs(lit) for lit in self.assumptions]))
+        try:
+            while True:
+                status = self.search(int(luby(2, self.restarts) * self.restart_base))
+                if status is True:
+                    return self.model()
+                if status is False:
+                    if not self.core:
+                        self.ok = False
+                    return None
+                self.restarts += 1
+        finally:
+            self.cancel_until(0)
+            self.assumptions = []
+
+    @classmethod
+    def from_file(cls, filename: str, **options) -> 'CDCLSolver':
+        clauses, num_vars = parse_dimacs(filename)
+        return cls(clauses, num_vars, **options)
+
+def cdcl(clauses: List[List[int]], num_vars: int) -> Optional[Dict[int, bool]]:
+    return CDCLSolver(clauses, num_vars).solve()
+
+def solve_sat(filename: str) -> Optional[Dict[int, bool]]:
+    clauses, num_vars = parse_dimacs(filename)
+    return cdcl(clauses, num_vars)
+
+def main():
+    directory = './benchmarks'
+    output_csv = 'cdcl_results.csv'
+
+    if not os.path.exists(directory):
+        print(f"Directory '{directory}' does not exist.")
+        sys.exit(1)
+
+    write_header = not os.path.exists(output_csv)
+
+    for filename, data in iter_sources(directory):
+        print(f"Processing {filename}...")
+
+        start_time = time.perf_counter()
+        tracemalloc.start()
+
+        cnf = parse_cnf(data)
+        solver = CDCLSolver(cnf.clauses(), cnf.num_vars)
+        result = solver.solve()
+        stats = solver.stats()
+
+        current, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        end_time = time.perf_counter()
+
+        time_taken = end_time - start_time
+        peak_memory = peak // 1024
+
+        result_str = 'SAT' if result is not None else 'UNSAT'
+        print(f"Result: {result_str}, Time: {time_taken:.4f}s, Peak Memory: {peak_memory} KB")
+
+        with open(output_csv, 'a', newline='') as csvfile:
+            writer = csv.writer(csvfile)
+            if write_header:
+                writer.writerow(['filename', 'time_sec', 'peak_mem_kb', 'result',
+                                 'decisions', 'conflicts', 'propagations', 'max_depth', 'restarts'])
+                write_header = False
+            writer.writerow([filename, f"{time_taken:.4f}", peak_memory, result_str,
+                             stats['decisions'], stats['conflicts'], stats['propagations'],
+                             stats['max_depth'], stats['restarts']])
+
+if __name__ == "__main__":
+    main()
@@ -3,33 +3,13 @@ import os
 import csv
 import time
 import tracemalloc
-from collections import defaultdict
-from typing import List, Dict, Set, Optional, Tuple
-
-def parse_dimacs(filename: str) -> Tuple[List[List[int]], int]:
-    clauses = []
-    num_vars = 0
-    with open(filename, 'r') as f:
-        for line in f:
-            line = line.strip()
-            if not line or line.startswith(('c', '%')):
-                continue
-            if line.startswith('p'):
-                parts = line.split()
-                if len(parts) >= 4:
-                    num_vars = int(parts[2])
-                continue
-            literals = []
-            for x in line.split():
-                try:
-                    literal = int(x)
-                    if literal != 0:
-                        literals.append(literal)
-                except ValueError:
-                    continue
-            if literals:
-                clauses.append(literals)
-    return clauses, num_vars
+import itertools
+import multiprocessing
+from collections import Counter, OrderedDict, defaultdict
+from typing import Callable, Iterator, List, Dict, Set, Optional, Tuple
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'common'))
+from dimacs import iter_sources, parse_cnf, parse_dimacs
 
 def unit_propagation(clauses: List[List[int]], assignment: Dict[int, bool]) -> Tuple[bool, List[List[int]]]:
     new_clauses = [clause[:] for clause in clauses]
@@ -77,14 +57,26 @@ def find_pure_literals(clauses: List[List[int]], assigned: Set[int]) -> List[int
             
     return pure_literals
 
-def dpll(clauses: List[List[int]], assignment: Dict[int, bool], num_vars: int) -> Optional[Dict[int, bool]]:
+def dpll(clauses: List[List[int]], assignment: Dict[int, bool], num_vars: int,
+         stats: Optional[Dict[str, int]] = None, depth: int = 0) -> Optional[Dict[int, bool]]:
+    if stats is not None:
+        for key in ('decisions', 'propagations', 'conflicts', 'max_depth'):
+            stats.setdefault(key, 0)
+        stats['max_depth'] = max(stats['max_depth'], depth)
     if not clauses:
         return assignment
     if any(len(clause) == 0 for clause in clauses):
+        if stats is not None:
+            stats['conflicts'] += 1
         return None
     
+    assigned_before = len(assignment)
     success, new_clauses = unit_propagation(clauses, assignment)
+    if stats is not None:
+        stats['propagations'] += len(assignment) - assigned_before
     if not success:
+        if stats is not None:
+            stats['conflicts'] += 1
         return None
     if not new_clauses:
         return assignment
@@ -103,15 +95,21 @@ def dpll(clauses: List[List[int]], assignment: Dict[int, bool], num_vars: int) -
         for lit in clause:
             var = abs(lit)
             if var not in assignment:
+                if stats is not None:
+                    stats['decisions'] += 1
                 new_assignment = assignment.copy()
                 new_assignment[var] = True
-                result = dpll([c[:] for c in new_clauses if lit not in c or -lit in c], new_assignment, num_vars)
+                result = dpll([c[:] for c in new_clauses if lit not in c or -lit in c], new_assignment, num_vars,
+                              stats, depth + 1)
                 if result is not None:
                     return result
                 
+                if stats is not None:
+                    stats['decisions'] += 1
                 new_assignment = assignment.copy()
                 new_assignment[var] = False
-                result = dpll([c[:] for c in new_clauses if -lit not in c or lit in c], new_assignment, num_vars)
+                result = dpll([c[:] for c in new_clauses if -lit not in c or lit in c], new_assignment, num_vars,
+                              stats, depth + 1)
                 if result is not None:
                     return result
                 break
@@ -120,12 +118,680 @@ def dpll(clauses: List[List[int]], assignment: Dict[int, bool], num_vars: int) -
             
     return None
 
-def solve_sat(filename: str) -> Optional[Dict[int, bool]]:
+HEURISTICS = ('first', 'dlis', 'moms', 'jw', 'vsids')
+
+class VarHeap:
+    def __init__(self, scores: List[float]):
+        self.scores = scores
+        self.heap: List[int] = []
+        self.position = [-1] * len(scores)
+
+    def __len__(self) -> int:
+        return len(self.heap)
+
+    def __contains__(self, var: int) -> bool:
+        return self.position[var] >= 0
+
+    def _before(self, a: int, b: int) -> bool:
+        return self.scores[a] > self.scores[b] or (self.scores[a] == self.scores[b] and a < b)
+
+    def _sift_up(self, i: int) -> None:
+        heap, position = self.heap, self.position
+        var = heap[i]
+        while i > 0:
+            parent = (i - 1) >> 1
+            if not self._before(var, heap[parent]):
+                break
+            heap[i] = heap[parent]
+            position[heap[i]] = i
+            i = parent
+        heap[i] = var
+        position[var] = i
+
+    def _sift_down(self, i: int) -> None:
+        heap, position = self.heap, self.position
+        var = heap[i]
+        size = len(heap)
+        while True:
+            child = 2 * i + 1
+            if child >= size:
+                break
+            if child + 1 < size and self._before(heap[child + 1], heap[child]):
+                child += 1
+            if not self._before(heap[child], var):
+                break
+            heap[i] = heap[child]
+            position[heap[i]] = i
+            i = child
+        heap[i] = var
+        position[var] = i
+
+    def push(self, var: int) -> None:
+        if self.position[var] >= 0:
+            return
+        self.heap.append(var)
+        self._sift_up(len(self.heap) - 1)
+
+    def pop(self) -> int:
+        heap = self.heap
+        top = heap[0]
+        last = heap.pop()
+        self.position[top] = -1
+        if heap:
+            heap[0] = last
+            self._sift_down(0)
+        return top
+
+    def increase(self, var: int) -> None:
+        if self.position[var] >= 0:
+            self._sift_up(self.position[var])
+
+    def decrease(self, var: int) -> None:
+        if self.position[var] >= 0:
+            self._sift_down(self.position[var])
+
+DYNAMIC = ('dlis', 'moms', 'jw')
+
+def clause_weight(heuristic: str, size: int) -> float:
+    if heuristic == 'jw':
+        return 2.0 ** -size
+    if heuristic == 'moms':
+        return 1024.0 ** -(size - 2)
+    return 1.0
+
+def combine_scores(heuristic: str, pos: float, neg: float) -> float:
+    if heuristic == 'dlis':
+        return max(pos, neg)
+    if heuristic == 'moms':
+        return (pos + neg) * 1024 + pos * neg
+    if heuristic == 'jw':
+        return pos + neg
+    return 0.0
+
+class TrailSolver:
+    def __init__(self, clauses: List[List[int]], num_vars: int, heuristic: str = 'first'):
+        if heuristic not in HEURISTICS:
+            raise ValueError(f"Unknown heuristic '{heuristic}'")
+        num_vars = max([num_vars] + [abs(lit) for clause in clauses for lit in clause])
+        self.num_vars = num_vars
+        self.ok = True
+        self.clauses: List[List[int]] = []
+        self.units: List[int] = []
+        self.values = [0] * (2 * num_vars + 1)
+        self.watches: List[List[int]] = [[] for _ in range(2 * num_vars + 1)]
+        self.level = [0] * (num_vars + 1)
+        self.trail: List[int] = []
+        self.trail_lim: List[int] = []
+        self.branches: List[Tuple[int, bool]] = []
+        self.decisions = 0
+        self.conflicts = 0
+        self.propagations = 0
+        self.max_depth = 0
+        self.progress: Optional[Callable[[Dict[str, int]], None]] = None
+        self.next_progress = -1
+        self.progress_every = 0
+        self.qhead = 0
+        self.occurs = [False] * (num_vars + 1)
+        for clause in clauses:
+            self.add_clause(clause)
+
+        self.heuristic = heuristic
+        self.var_inc = 1.0
+        self.pos = [0.0] * (num_vars + 1)
+        self.neg = [0.0] * (num_vars + 1)
+        self.occ: Optional[List[List[int]]] = None
+        self.true_count = [0] * len(self.clauses)
+        self.free = [len(clause) for clause in self.clauses]
+        for index in range(len(self.clauses)):
+            self.tally(index, 1.0)
+        if heuristic in DYNAMIC:
+            self.occ = [[] for _ in range(2 * num_vars + 1)]
+            for index, clause in enumerate(self.clauses):
+                for lit in clause:
+                    self.occ[num_vars + lit].append(index)
+        self.scores = [combine_scores(heuristic, p, q) for p, q in zip(self.pos, self.neg)]
+        self.order: Optional[VarHeap] = None
+        if heuristic != 'first':
+            self.order = VarHeap(self.scores)
+            for var in range(1, num_vars + 1):
+                if self.occurs[var]:
+                    self.order.push(var)
+
+    def add_clause(self, clause: List[int]) -> None:
+        literals = list(dict.fromkeys(clause))
+        if any(-lit in literals for lit in literals):
+            return
+        for lit in literals:
+            self.occurs[abs(lit)] = True
+        if not literals:
+            self.ok = False
+        elif len(literals) == 1:
+            self.units.append(literals[0])
+        else:
+            index = len(self.clauses)
+            self.clauses.append(literals)
+            self.watches[self.num_vars + literals[0]].append(index)
+            self.watches[self.num_vars + literals[1]].append(index)
+
+    def value(self, lit: int) -> int:
+        return self.values[self.num_vars + lit]
+
+    def stats(self) -> Dict[str, int]:
+        return {'decisions': self.decisions, 'propagations': self.propagations,
+                'conflicts': self.conflicts, 'max_depth': self.max_depth}
+
+    def set_progress(self, callback: Optional[Callable[[Dict[str, int]], None]], every: int = 1000) -> None:
+        self.progress = callback
+        self.progress_every = every
+        self.next_progress = self.decisions + every if callback is not None else -1
+
+    def tally(self, index: int, sign: float) -> None:
+        values, n = self.values, self.num_vars
+        weight = sign * clause_weight(self.heuristic, self.free[index])
+        for lit in self.clauses[index]:
+            if values[n + lit] == 0:
+                if lit > 0:
+                    self.pos[lit] += weight
+                else:
+                    self.neg[-lit] += weight
+
+    def retally(self, lit: int, value: int) -> None:
+        n = self.num_vars
+        touched = self.occ[n + lit] + self.occ[n - lit]
+        true_count, free = self.true_count, self.free
+        for index in touched:
+            if true_count[index] == 0:
+                self.tally(index, -1.0)
+        self.values[n + lit] = value
+        self.values[n - lit] = -value
+        step = 1 if value else -1
+        for index in self.occ[n + lit]:
+            true_count[index] += step
+        for index in touched:
+            free[index] -= step
+        for index in touched:
+            if true_count[index] == 0:
+                self.tally(index, 1.0)
+        heuristic, scores, order = self.heuristic, self.scores, self.order
+        for index in touched:
+            for other in self.clauses[index]:
+                var = abs(other)
+                old = scores[var]
+                scores[var] = combine_scores(heuristic, self.pos[var], self.neg[var])
+                if order is not None:
+                    if scores[var] > old:
+                        order.increase(var)
+                    elif scores[var] < old:
+                        order.decrease(var)
+
+    def assign(self, lit: int) -> None:
+        if self.occ is not None:
+            self.retally(lit, 1)
+        else:
+            self.values[self.num_vars + lit] = 1
+            self.values[self.num_vars - lit] = -1
+        self.level[abs(lit)] = len(self.trail_lim)
+        self.trail.append(lit)
+
+    def propagate(self) -> Optional[int]:
+        n = self.num_vars
+        values = self.values
+        watches = self.watches
+        clauses = self.clauses
+        trail = self.trail
+        while self.qhead < len(trail):
+            false_lit = -trail[self.qhead]
+            self.qhead += 1
+            self.propagations += 1
+            watching = watches[n + false_lit]
+            i = j = 0
+            while i < len(watching):
+                index = watching[i]
+                i += 1
+                clause = clauses[index]
+                if clause[0] == false_lit:
+                    clause[0], clause[1] = clause[1], false_lit
+                first = clause[0]
+                if values[n + first] == 1:
+                    watching[j] = index
+                    j += 1
+                    continue
+                for k in range(2, len(clause)):
+                    lit = clause[k]
+                    if values[n + lit] != -1:
+                        clause[1], clause[k] = lit, false_lit
+                        watches[n + lit].append(index)
+                        break
+                else:
+                    watching[j] = index
+                    j += 1
+                    if values[n + first] == -1:
+                        while i < len(watching):
+                            watching[j] = watching[i]
+                            i += 1
+                            j += 1
+                        del watching[j:]
+                        return index
+                    self.assign(first)
+            del watching[j:]
+        return None
+
+    def cancel_until(self, level: int) -> None:
+        if len(self.trail_lim) <= level:
+            return
+        n = self.num_vars
+        start = self.trail_lim[level]
+        for lit in reversed(self.trail[start:]):
+            if self.occ is not None:
+                self.retally(lit, 0)
+            else:
+                self.values[n + lit] = 0
+                self.values[n - lit] = 0
+            if self.order is not None:
+                self.order.push(abs(lit))
+        del self.trail[start:]
+        del self.trail_lim[level:]
+        del self.branches[level:]
+        self.qhead = len(self.trail)
+
+    def decide(self, lit: int, flipped: bool = False) -> None:
+        self.trail_lim.append(len(self.trail))
+        self.branches.append((lit, flipped))
+        self.assign(lit)
+        if len(self.trail_lim) > self.max_depth:
+            self.max_depth = len(self.trail_lim)
+
+    def pick_branch_literal(self) -> Optional[int]:
+        n = self.num_vars
+        if self.order is None:
+            for var in range(1, n + 1):
+                if self.occurs[var] and self.values[n + var] == 0:
+                    return var
+            return None
+        while self.order:
+            var = self.order.pop()
+            if self.values[n + var] == 0:
+                return var if self.pos[var] >= self.neg[var] else -var
+        return None
+
+    def bump_conflict(self, index: int) -> None:
+        scores = self.scores
+        for lit in self.clauses[index]:
+            var = abs(lit)
+            scores[var] += self.var_inc
+            self.order.increase(var)
+        if self.var_inc > 1e100:
+            for var in range(len(scores)):
+                scores[var] *= 1e-100
+            self.var_inc *= 1e-100
+        self.var_inc /= 0.95
+
+    def backtrack(self) -> bool:
+        while self.branches:
+            lit, flipped = self.branches[-1]
+            self.cancel_until(len(self.trail_lim) - 1)
+            if not flipped:
+                self.decide(-lit, flipped=True)
+                return True
+        return False
+
+    def model(self, total: bool = False) -> Dict[int, bool]:
+        model = dict.fromkeys(range(1, self.num_vars + 1), False) if total else {}
+        model.update((abs(lit), lit > 0) for lit in self.trail)
+        return model
+
+    def satisfied(self) -> bool:
+        values, n = self.values, self.num_vars
+        return all(any(values[n + lit] == 1 for lit in clause) for clause in self.clauses)
+
+    def start(self) -> bool:
+        self.cancel_until(0)
+        if not self.ok:
+            return False
+        for lit in self.units:
+            value = self.value(lit)
+            if value == -1:
+                self.ok = False
+                return False
+            if value == 0:
+                self.assign(lit)
+        if self.propagate() is not None:
+            self.ok = False
+        return self.ok
+
+    def enumerate(self, minimize: bool = True) -> Iterator[Dict[int, bool]]:
+        if not self.start():
+            return
+        while True:
+            conflict = self.propagate()
+            if conflict is not None:
+                self.conflicts += 1
+                if self.heuristic == 'vsids':
+                    self.bump_conflict(conflict)
+                if not self.backtrack():
+                    return
+                continue
+            lit = None if minimize and self.satisfied() else self.pick_branch_literal()
+            if lit is None:
+                yield self.model()
+                if not self.backtrack():
+                    return
+                continue
+            self.decisions += 1
+            if self.decisions == self.next_progress:
+                self.next_progress += self.progress_every
+                self.progress(self.stats())
+            self.decide(lit)
+
+    def lookahead(self, lit: int) -> Optional[int]:
+        level = len(self.trail_lim)
+        before = len(self.trail)
+        self.decide(lit)
+        conflict = self.propagate()
+        gained = len(self.trail) - before
+        self.cancel_until(level)
+        return None if conflict is not None else gained
+
+    def select_split(self, candidates: List[int], width: int) -> Tuple[bool, Optional[int]]:
+        n = self.num_vars
+        while True:
+            best, best_score, forced = None, -1, None
+            for var in [v for v in candidates if self.values[n + v] == 0][:width]:
+                pos = self.lookahead(var)
+                neg = self.lookahead(-var)
+                if pos is None and neg is None:
+                    return False, None
+                if pos is None or neg is None:
+                    forced = -var if pos is None else var
+                    break
+                score = pos * neg * 1024 + pos + neg
+                if score > best_score:
+                    best, best_score = var, score
+            if forced is None:
+                return True, best
+            self.assign(forced)
+            if self.propagate() is not None:
+                return False, None
+
+    def make_cubes(self, depth: int, width: int = 32) -> Tuple[List[List[int]], int]:
+        if not self.start():
+            return [], 1
+        occurrences = Counter(abs(lit) for clause in self.clauses for lit in clause)
+        candidates = sorted(occurrences, key=lambda var: (-occurrences[var], var))
+        cubes: List[List[int]] = []
+        refuted = 0
+
+        def split(prefix: List[int]) -> None:
+            nonlocal refuted
+            if len(prefix) == depth:
+                cubes.append(prefix)
+                return
+            ok, var = self.select_split(candidates, width)
+            if not ok:
+                refuted += 1
+                return
+            if var is None:
+                cubes.append(prefix)
+                return
+            for lit in (var, -var):
+                level = len(self.trail_lim)
+                self.decide(lit)
+                if self.propagate() is None:
+                    split(prefix + [lit])
+                else:
+                    refuted += 1
+                self.cancel_until(level)
+
+        split([])
+        self.cancel_until(0)
+        return cubes, refuted
+
+    def solve(self) -> Optional[Dict[int, bool]]:
+        if not self.start():
+            return None
+
+        while True:
+            conflict = self.propagate()
+            if conflict is not None:
+                self.conflicts += 1
+                if self.heuristic == 'vsids':
+                    self.bump_conflict(conflict)
+                if not self.backtrack():
+                    return None
+                continue
+            lit = self.pick_branch_literal()
+            if lit is None:
+                return self.model(total=True)
+            self.decisions += 1
+            if self.decisions == self.next_progress:
+                self.next_progress += self.progress_every
+                self.progress(self.stats())
+            self.decide(lit)
+
+def dpll_trail(clauses: List[List[int]], num_vars: int, heuristic: str = 'first') -> Optional[Dict[int, bool]]:
+    return TrailSolver(clauses, num_vars, heuristic).solve()
+
+_cube_formula: Tuple[List[List[int]], int, str] = ([], 0, 'first')
+
+def _init_cube_worker(clauses: List[List[int]], num_vars: int, heuristic: str) -> None:
+    global _cube_formula
+    _cube_formula = (clauses, num_vars, heuristic)
+
+def _solve_cube(task: Tuple[int, List[int]]) -> Tuple[int, Optional[Dict[int, bool]], float, Dict[str, int]]:
+    index, cube = task
+    clauses, num_vars, heuristic = _cube_formula
+    start = time.perf_counter()
+    solver = TrailSolver(clauses + [[lit] for lit in cube], num_vars, heuristic)
+    model = solver.solve()
+    return index, model, time.perf_counter() - start, solver.stats()
+
+def cube_and_conquer(clauses: List[List[int]], num_vars: int, depth: Optional[int] = None, jobs: int = 0,
+                     heuristic: str = 'vsids', width: int = 32
+                     ) -> Tuple[Optional[Dict[int, bool]], List[Dict[str, object]], Dict[str, object]]:
+    jobs = jobs or os.cpu_count() or 1
+    if depth is None:
+        depth = max(1, (4 * jobs - 1).bit_length())
+    start = time.perf_counter()
+    cubes, refuted = TrailSolver(clauses, num_vars, 'first').make_cubes(depth, width)
+    summary = {'cubes': len(cubes), 'refuted': refuted, 'depth': depth, 'split_sec': time.perf_counter() - start}
+
+    rows = []
+    model = None
+    tasks = list(enumerate(cubes))
+    if jobs == 1 or len(tasks) < 2 or multiprocessing.current_process().daemon:
+        _init_cube_worker(clauses, num_vars, heuristic)
+        results = map(_solve_cube, tasks)
+        pool = None
+    else:
+        methods = multiprocessing.get_all_start_methods()
+        context = multiprocessing.get_context('fork' if 'fork' in methods else None)
+        pool = context.Pool(min(jobs, len(tasks)), _init_cube_worker, (clauses, num_vars, heuristic))
+        results = pool.imap_unordered(_solve_cube, tasks)
+    try:
+        for index, found, elapsed, stats in results:
+            rows.append({'cube': index, 'literals': ' '.join(map(str, cubes[index])),
+                         'result': 'UNSAT' if found is None else 'SAT', 'time_sec': elapsed, **stats})
+            if found is not None:
+                model = found
+                break
+    finally:
+        if pool is not None:
+            pool.terminate()
+            pool.join()
+    summary['cubes_solved'] = len(rows)
+    return model, rows, summary
+
+def expand_cube(cube: Dict[int, bool], num_vars: int) -> Iterator[Dict[int, bool]]:
+    free = [var for var in range(1, num_vars + 1) if var not in cube]
+    for values in itertools.product((False, True), repeat=len(free)):
+        model = dict(cube)
+        model.update(zip(free, values))
+        yield model
+
+def enumerate_models(clauses: List[List[int]], num_vars: int, heuristic: str = 'first',
+                     cubes: bool = False, solver: Optional[TrailSolver] = None) -> Iterator[Dict[int, bool]]:
+    solver = solver or TrailSolver(clauses, num_vars, heuristic)
+    num_vars = max(num_vars, solver.num_vars)
+    for cube in solver.enumerate(minimize=True):
+        if cubes:
+            yield cube
+        else:
+            yield from expand_cube(cube, num_vars)
+
+def count_by_enumeration(solver: TrailSolver, num_vars: int = 0) -> Tuple[int, int]:
+    num_vars = max(num_vars, solver.num_vars)
+    models = cubes = 0
+    for cube in solver.enumerate(minimize=True):
+        cubes += 1
+        models += 1 << (num_vars - len(cube))
+    return models, cubes
+
+class ModelCounter:
+    def __init__(self, cache_literals: int = 1000000):
+        self.cache_literals = cache_literals
+        self.cache: 'OrderedDict[frozenset, int]' = OrderedDict()
+        self.cached_literals = 0
+        self.decisions = 0
+        self.components = 0
+        self.cache_hits = 0
+
+    def stats(self) -> Dict[str, int]:
+        return {'decisions': self.decisions, 'components': self.components, 'cache_hits': self.cache_hits,
+                'cache_entries': len(self.cache), 'cache_literals': self.cached_literals}
+
+    @staticmethod
+    def condition(clauses: List[Tuple[int, ...]], lits: List[int]) -> Tuple[Optional[List[Tuple[int, ...]]], Set[int]]:
+        assigned = set(lits)
+        while True:
+            remaining = []
+            units = []
+            for clause in clauses:
+                if any(lit in assigned for lit in clause):
+                    continue
+                reduced = tuple(lit for lit in clause if -lit not in assigned)
+                if not reduced:
+                    return None, assigned
+                if len(reduced) == 1:
+                    units.append(reduced[0])
+                else:
+                    remaining.append(reduced)
+            if not units:
+                return remaining, assigned
+            for lit in units:
+                if -lit in assigned:
+                    return None, assigned
+                assigned.add(lit)
+            clauses = remaining
+
+    @staticmethod
+    def split(clauses: List[Tuple[int, ...]]) -> List[List[Tuple[int, ...]]]:
+        parent = {}
+
+        def find(var):
+            while parent[var] != var:
+                parent[var] = parent[parent[var]]
+                var = parent[var]
+            return var
+
+        for clause in clauses:
+            for lit in clause:
+                parent.setdefault(abs(lit), abs(lit))
+        for clause in clauses:
+            root = find(abs(clause[0]))
+            for lit in clause[1:]:
+                other = find(abs(lit))
+                if other != root:
+                    parent[other] = root
+        groups: Dict[int, List[Tuple[int, ...]]] = {}
+        for clause in clauses:
+            groups.setdefault(find(abs(clause[0])), []).append(clause)
+        return list(groups.values())
+
+    def lookup(self, key: frozenset) -> Optional[int]:
+        cached = self.cache.get(key)
+        if cached is not None:
+            self.cache_hits += 1
+            self.cache.move_to_end(key)
+        return cached
+
+    def store(self, key: frozenset, count: int) -> None:
+        size = sum(len(clause) for clause in key)
+        if size > self.cache_literals:
+            return
+        self.cache[key] = count
+        self.cached_literals += size
+        while self.cached_literals > self.cache_literals:
+            evicted, _ = self.cache.popitem(last=False)
+            self.cached_literals -= sum(len(clause) for clause in evicted)
+
+    def decompose(self, clauses: List[Tuple[int, ...]]) -> List[List[Tuple[int, ...]]]:
+        components = self.split(clauses)
+        if len(components) > 1:
+            self.components += len(components)
+        return components[::-1]
+
+    def branch(self, clauses: List[Tuple[int, ...]], num_vars: int,
+               lit: int) -> Tuple[int, List[List[Tuple[int, ...]]], int]:
+        self.decisions += 1
+        remaining, assigned = self.condition(clauses, [lit])
+        if remaining is None:
+            return 0, [], 0
+        free = num_vars - len(assigned) - len({abs(l) for clause in remaining for l in clause})
+        return 1, self.decompose(remaining), free
+
+    def count_clauses(self, clauses: List[Tuple[int, ...]]) -> int:
+        frames = []
+        product, pending, shift = 1, self.decompose(clauses), 0
+        while True:
+            if pending and product:
+                component = pending.pop()
+                key = frozenset(component)
+                cached = self.lookup(key)
+                if cached is not None:
+                    product *= cached
+                    continue
+                occurrences = Counter(abs(lit) for clause in component for lit in clause)
+                var = max(occurrences, key=occurrences.get)
+                frames.append([key, component, len(occurrences), [-var], 0, product, pending, shift])
+                product, pending, shift = self.branch(component, len(occurrences), var)
+                continue
+            if not frames:
+                return product << shift
+            frame = frames[-1]
+            frame[4] += product << shift
+            if frame[3]:
+                product, pending, shift = self.branch(frame[1], frame[2], frame[3].pop())
+                continue
+            frames.pop()
+            key, _, _, _, total, product, pending, shift = frame
+            self.store(key, total)
+            product *= total
+
+    def count(self, clauses: List[List[int]], num_vars: int) -> int:
+        normalized = set()
+        variables = set(range(1, num_vars + 1))
+        for clause in clauses:
+            literals = tuple(sorted(set(clause)))
+            variables.update(abs(lit) for lit in literals)
+            if not any(-lit in literals for lit in literals):
+                normalized.add(literals)
+        remaining, assigned = self.condition(list(normalized), [])
+        if remaining is None:
+            return 0
+        free = len(variables) - len(assigned) - len({abs(lit) for clause in remaining for lit in clause})
+        return self.count_clauses(remaining) << free
+
+def count_models(clauses: List[List[int]], num_vars: int, cache_literals: int = 1000000) -> int:
+    return ModelCounter(cache_literals).count(clauses, num_vars)
+
+def solve_sat(filename: str, engine: str = 'recursive', heuristic: str = 'first') -> Optional[Dict[int, bool]]:
     clauses, num_vars = parse_dimacs(filename)
+    if engine == 'trail':
+        return dpll_trail(clauses, num_vars, heuristic)
     assignment = {}
     return dpll(clauses, assignment, num_vars)
 
-def main():
+def main(engine: str = 'recursive', heuristic: str = 'first'):
     directory = './benchmarks'  
     output_csv = 'sat_results.csv'
     
@@ -133,18 +799,38 @@ def main():
         print(f"Directory '{directory}' does not exist.")
         sys.exit(1)
     
-    files = [f for f in os.listdir(directory) if f.endswith('.cnf')]
-    
     write_header = not os.path.exists(output_csv)
     
-    for filename in files:
-        filepath = os.path.join(directory, filename)
+    for filename, data in iter_sources(directory):
         print(f"Processing {filename}...")
         
         start_time = time.perf_counter()
         tracemalloc.start()
         
-        result = solve_sat(filepath)
+        cnf = parse_cnf(data)
+        models = ''
+        if engine == 'trail':
+            solver = TrailSolver(cnf.clauses(), cnf.num_vars, heuristic)
+            result = solver.solve()
+            stats = solver.stats()
+        elif engine == 'enumerate':
+            solver = TrailSolver(cnf.clauses(), cnf.num_vars, heuristic)
+            models, _ = count_by_enumeration(solver, cnf.num_vars)
+            result = models
+            stats = solver.stats()
+        elif engine == 'cubes':
+            result, cube_rows, stats = cube_and_conquer(cnf.clauses(), cnf.num_vars, heuristic=heuristic)
+            for row in sorted(cube_rows, key=lambda row: row['cube']):
+                print(f"  cube {row['cube']} [{row['literals']}]: {row['result']} in {row['time_sec']:.4f}s, "
+                      f"{row['decisions']} decisions, {row['conflicts']} conflicts")
+        elif engine == 'count':
+            counter = ModelCounter()
+            models = counter.count(cnf.clauses(), cnf.num_vars)
+            result = models
+            stats = counter.stats()
+        else:
+            stats = {}
+            result = dpll(cnf.clauses(), {}, cnf.num_vars, stats)
         
         current, peak = tracemalloc.get_traced_memory()
         tracemalloc.stop()
@@ -154,16 +840,23 @@ def main():
         peak_memory = peak // 1024
         
         result_str = 'SAT' if result else 'UNSAT'
-        print(f"Result: {result_str}, Time: {time_taken:.4f}s, Peak Memory: {peak_memory} KB")
+        print(f"Result: {result_str}, Time: {time_taken:.4f}s, Peak Memory: {peak_memory} KB"
+              + (f", Models: {models}" if models != '' else ''))
         
         with open(output_csv, 'a', newline='') as csvfile:
             writer = csv.writer(csvfile)
             if write_header:
-                writer.writerow(['filename', 'time_sec', 'peak_mem_kb', 'result'])
+                writer.writerow(['filename', 'time_sec', 'peak_mem_kb', 'result',
+                                 'engine', 'heuristic', 'decisions', 'conflicts', 'propagations', 'max_depth',
+                                 'models'])
                 write_header = False
-            writer.writerow([filename, f"{time_taken:.4f}", peak_memory, result_str])
+            writer.writerow([filename, f"{time_taken:.4f}", peak_memory, result_str,
+                             engine, heuristic if engine in ('trail', 'enumerate', 'cubes') else '',
+                             stats.get('decisions', 0), stats.get('conflicts', 0),
+                             stats.get('propagations', 0), stats.get('max_depth', 0), models])
 
 if __name__ == "__main__":
-    main()
+    main(sys.argv[1] if len(sys.argv) > 1 else 'recursive',
+         sys.argv[2] if len(sys.argv) > 2 else 'first')
 
 
@@ -1,128 +1,505 @@
+import sys
 import random
 import time
 import os
 import csv
+import argparse
 import tracemalloc
 
-def parse_cnf_file(filepath):
-    clauses = []
-    num_variables = 0
-    
-    with open(filepath, 'r') as f:
-        for line in f:
-            line = line.strip()
-            if not line or line.startswith('c') or line.startswith('%'):
-                continue
-            if line.startswith('p'):
-                parts = line.split()
-                if parts[1] != 'cnf':
-                    raise ValueError("File is not in CNF format")
-                num_variables = int(parts[2])
-                continue
-            try:
-                literals = [int(x) for x in line.split() if x != '0']
-                if literals: 
-                    clauses.append(frozenset(literals))  
-            except ValueError:
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'common'))
+from dimacs import iter_sources, parse_cnf
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+class WalkState:
+    def __init__(self, clauses, num_variables, assignment):
+        self.num_variables = num_variables
+        self.assignment = assignment
+        self.clauses = []
+        self.pos_occ = [[] for _ in range(num_variables + 1)]
+        self.neg_occ = [[] for _ in range(num_variables + 1)]
+        for clause in clauses:
+            literals = list(dict.fromkeys(clause))
+            if any(-lit in literals for lit in literals):
                 continue
-    
-    return clauses, num_variables
+            index = len(self.clauses)
+            self.clauses.append(literals)
+            for lit in literals:
+                if lit > 0:
+                    self.pos_occ[lit].append(index)
+                else:
+                    self.neg_occ[-lit].append(index)
+
+        self.true_count = [0] * len(self.clauses)
+        self.critical = [0] * len(self.clauses)
+        self.break_count = [0] * (num_variables + 1)
+        self.make_count = [0] * (num_variables + 1)
+        self.unsat = []
+        self.unsat_pos = [-1] * len(self.clauses)
+        self.recompute()
+
+    def recompute(self):
+        assignment = self.assignment
+        for v in range(self.num_variables + 1):
+            self.break_count[v] = 0
+            self.make_count[v] = 0
+        self.unsat = []
+        for index, clause in enumerate(self.clauses):
+            count = 0
+            last = 0
+            for lit in clause:
+                if assignment[abs(lit)] == (lit > 0):
+                    count += 1
+                    last = abs(lit)
+            self.true_count[index] = count
+            self.critical[index] = last if count == 1 else 0
+            self.unsat_pos[index] = -1
+            if count == 0:
+                self._add_unsat(index)
+            elif count == 1:
+                self.break_count[last] += 1
+
+    def _add_unsat(self, index):
+        self.unsat_pos[index] = len(self.unsat)
+        self.unsat.append(index)
+        for lit in self.clauses[index]:
+            self.make_count[abs(lit)] += 1
+
+    def _remove_unsat(self, index):
+        pos = self.unsat_pos[index]
+        last = self.unsat.pop()
+        if last != index:
+            self.unsat[pos] = last
+            self.unsat_pos[last] = pos
+        self.unsat_pos[index] = -1
+        for lit in self.clauses[index]:
+            self.make_count[abs(lit)] -= 1
+
+    def flip(self, var):
+        assignment = self.assignment
+        assignment[var] = not assignment[var]
+        if assignment[var]:
+            now_true, now_false = self.pos_occ[var], self.neg_occ[var]
+        else:
+            now_true, now_false = self.neg_occ[var], self.pos_occ[var]
+
+        true_count = self.true_count
+        critical = self.critical
+        break_count = self.break_count
+
+        for index in now_true:
+            count = true_count[index]
+            if count == 0:
+                self._remove_unsat(index)
+                critical[index] = var
+                break_count[var] += 1
+            elif count == 1:
+                break_count[critical[index]] -= 1
+                critical[index] = 0
+            true_count[index] = count + 1
+
+        for index in now_false:
+            count = true_count[index] - 1
+            true_count[index] = count
+            if count == 0:
+                break_count[var] -= 1
+                critical[index] = 0
+                self._add_unsat(index)
+            elif count == 1:
+                for lit in self.clauses[index]:
+                    v = abs(lit)
+                    if assignment[v] == (lit > 0):
+                        critical[index] = v
+                        break_count[v] += 1
+                        break
+
+
+ALGORITHMS = ("walksat", "probsat", "novelty+")
+RESTART_POLICIES = ("none", "fixed", "luby", "geometric")
+DISTRIBUTIONS = {"poly": 2.38, "exp": 2.5}
+NOISE_PHI = 0.2
+NOISE_THETA = 1 / 6
+SINK_COUNT = 1 << 40
+
+STAT_FIELDS = ["flips", "random_moves", "greedy_moves", "sampled_moves", "restarts", "best_unsat", "noise"]
+
+def luby(index):
+    size, power = 1, 0
+    while size < index + 1:
+        power += 1
+        size = 2 * size + 1
+    while size - 1 != index:
+        size = (size - 1) >> 1
+        power -= 1
+        index %= size
+    return 1 << power
+
+def restart_interval(policy, base, index):
+    if policy == "fixed":
+        return base
+    if policy == "luby":
+        return base * luby(index)
+    if policy == "geometric":
+        return int(base * 1.5 ** index)
+    return -1
+
+def break_weights(distribution, cb, eps, size):
+    if distribution == "poly":
+        return [(eps + b) ** -cb for b in range(size)]
+    return [cb ** -b for b in range(size)]
+
+def walksat(clauses, num_variables, max_flips, p=0.5, stats=None, progress=None, progress_every=1000,
+            algorithm="walksat", seed=None, restart="none", restart_base=1000, adaptive=False,
+            distribution="poly", cb=None, eps=1.0, wp=0.01, tabu=0):
+    if algorithm not in ALGORITHMS:
+        raise ValueError(f"Unknown algorithm '{algorithm}', expected one of {', '.join(ALGORITHMS)}")
+    if restart not in RESTART_POLICIES:
+        raise ValueError(f"Unknown restart policy '{restart}', expected one of {', '.join(RESTART_POLICIES)}")
+    if distribution not in DISTRIBUTIONS:
+        raise ValueError(f"Unknown distribution '{distribution}', expected one of {', '.join(DISTRIBUTIONS)}")
+
+    rng = random.Random(random.getrandbits(64) if seed is None else seed)
+    assignment = [rng.random() < 0.5 for _ in range(num_variables + 1)]
+    state = WalkState(clauses, num_variables, assignment)
+    break_count, make_count = state.break_count, state.make_count
+    age = [-tabu - 1] * (num_variables + 1)
+    if algorithm == "probsat":
+        longest = max((len(state.pos_occ[v]) + len(state.neg_occ[v]) for v in range(num_variables + 1)), default=0)
+        weights = break_weights(distribution, DISTRIBUTIONS[distribution] if cb is None else cb, eps, longest + 1)
+
+    noise = 0.0 if adaptive else p
+    adapt_at = max(1, int(NOISE_THETA * len(state.clauses)))
+    adapt_best = best_unsat = len(state.unsat)
+    last_adapted = 0
+    random_moves = sampled_moves = restarts = flips = 0
+    next_restart = restart_interval(restart, restart_base, 0)
+    next_progress = progress_every if progress is not None else -1
+    trivial = any(not clause for clause in state.clauses)
+
+    while state.unsat and flips < max_flips and not trivial:
+        if flips == next_progress:
+            next_progress += progress_every
+            progress({"flips": flips, "random_moves": random_moves, "sampled_moves": sampled_moves,
+                      "greedy_moves": flips - random_moves - sampled_moves,
+                      "restarts": restarts, "unsat": len(state.unsat), "best_unsat": best_unsat,
+                      "noise": round(noise, 4)})
+
+        if flips == next_restart:
+            restarts += 1
+            next_restart = flips + restart_interval(restart, restart_base, restarts)
+            for v in range(1, num_variables + 1):
+                assignment[v] = rng.random() < 0.5
+            state.recompute()
+            adapt_best = len(state.unsat)
+            last_adapted = flips
+            if not state.unsat:
+                break
+
+        unsat = state.unsat
+        clause = state.clauses[unsat[rng.randrange(len(unsat))]]
+
+        if algorithm == "probsat":
+            sampled_moves += 1
+            var = abs(rng.choices(clause, [weights[break_count[abs(lit)]] for lit in clause])[0])
+        elif algorithm == "novelty+" and rng.random() < wp:
+            random_moves += 1
+            var = abs(rng.choice(clause))
+        elif algorithm == "walksat" and rng.random() < noise:
+            random_moves += 1
+            var = abs(rng.choice(clause))
+        else:
+            candidates = [abs(lit) for lit in clause]
+            if tabu:
+                candidates = [v for v in candidates if flips - age[v] > tabu] or candidates
+            if algorithm == "walksat":
+                var = min(candidates, key=lambda v: break_count[v] - make_count[v])
+            else:
+                ranked = sorted(candidates, key=lambda v: (break_count[v] - make_count[v], age[v]))
+                var = ranked[0]
+                youngest = max((abs(lit) for lit in clause), key=lambda v: age[v])
+                if var == youngest and len(ranked) > 1 and rng.random() < noise:
+                    var = ranked[1]
+
+        state.flip(var)
+        flips += 1
+        age[var] = flips
+
+        current = len(state.unsat)
+        if current < best_unsat:
+            best_unsat = current
+        if adaptive:
+            if current < adapt_best:
+                noise -= noise * NOISE_PHI / 2
+                adapt_best = current
+                last_adapted = flips
+            elif flips - last_adapted > adapt_at:
+                noise += (1 - noise) * NOISE_PHI
+                adapt_best = current
+                last_adapted = flips
+
+    if stats is not None:
+        stats.update(flips=flips, random_moves=random_moves, greedy_moves=flips - random_moves - sampled_moves,
+                     sampled_moves=sampled_moves, restarts=restarts,
+                     best_unsat=best_unsat, noise=round(noise, 4))
+    if not state.unsat:
+        return assignment[1:], 'SAT'
+    if trivial:
+        return None, 'UNSAT'
+    return None, 'UNKNOWN'
+
+def flatten_clauses(clauses):
+    kept = []
+    for clause in clauses:
+        literals = list(dict.fromkeys(clause))
+        if len(set(map(abs, literals))) == len(literals):
+            kept.append(literals)
+    flat = np.fromiter((lit for literals in kept for lit in literals), dtype=np.int64)
+    return flat, np.fromiter(map(len, kept), dtype=np.int64, count=len(kept))
+
+def pack_batch(formulas, num_variables):
+    size = len(formulas)
+    stride = num_variables + 1
+    flattened = {}
+    for clauses in formulas:
+        if id(clauses) not in flattened:
+            flattened[id(clauses)] = flatten_clauses(clauses)
+    parts = [flattened[id(clauses)] for clauses in formulas]
+    flat = np.concatenate([literals for literals, _ in parts])
+    sizes = np.concatenate([lengths for _, lengths in parts])
+    counts = np.fromiter((len(lengths) for _, lengths in parts), dtype=np.int64, count=size)
+    num_clauses = max(int(counts.max()), 1)
+    width = max(int(sizes.max(initial=0)), 1)
+
+    walker = np.repeat(np.arange(size), counts)
+    clause = walker * num_clauses + np.arange(len(walker)) - np.repeat(np.cumsum(counts) - counts, counts)
+    lit_clause = np.repeat(clause, sizes)
+    slot = np.arange(len(flat)) - np.repeat(np.cumsum(sizes) - sizes, sizes)
+    lit_var = np.repeat(walker, sizes) * stride + np.abs(flat)
+
+    variables = np.zeros((size * num_clauses, width), dtype=np.int64)
+    variables += np.repeat(np.arange(size) * stride, num_clauses)[:, None]
+    signs = np.ones((size * num_clauses, width), dtype=bool)
+    lengths = np.zeros(size * num_clauses, dtype=np.int64)
+    variables[lit_clause, slot] = lit_var
+    signs[lit_clause, slot] = flat > 0
+    lengths[clause] = sizes
+    present = np.zeros(size * num_clauses, dtype=bool)
+    present[clause] = True
+
+    order = np.argsort(lit_var, kind='stable')
+    occurrences = np.bincount(lit_var, minlength=size * stride)
+    rank = np.arange(len(order)) - np.repeat(np.cumsum(occurrences) - occurrences, occurrences)
+    depth = max(int(occurrences.max(initial=0)), 1)
+    occ_clause = np.full((size * stride, depth), size * num_clauses, dtype=np.int64)
+    occ_sign = np.zeros((size * stride, depth), dtype=bool)
+    occ_clause[lit_var[order], rank] = lit_clause[order]
+    occ_sign[lit_var[order], rank] = flat[order] > 0
+    return variables, signs, lengths, present, occ_clause, occ_sign
+
+def walksat_batch(formulas, num_variables, max_flips, p=0.5, seed=None):
+    if np is None:
+        raise RuntimeError("walksat_batch requires numpy")
+    rng = np.random.default_rng(seed)
+    literals, signs, lengths, present, occ_clause, occ_sign = pack_batch(formulas, num_variables)
+    size = len(formulas)
+    num_clauses = len(lengths) // size
+    stride = num_variables + 1
+    var_base = np.arange(size, dtype=np.int64) * stride
+    positions = np.arange(literals.shape[1])
+    slots = np.arange(occ_clause.shape[1])
+
+    assignment = rng.random(size * stride) < 0.5
+    assignment[var_base] = False
+    true = assignment[literals] == signs
+    true_count = np.append(np.where(present, true.sum(axis=1), 2), SINK_COUNT)
+    true_sum = np.append((true * literals).sum(axis=1), 0)
+    unsat = np.flatnonzero(true_count == 0)
+    score = (np.bincount(true_sum[true_count == 1], minlength=size * stride)
+             - np.bincount(literals[unsat].reshape(-1), minlength=size * stride))
+    num_unsat = np.bincount(unsat // num_clauses, minlength=size)
+    unsat_list = np.zeros((size, num_clauses), dtype=np.int64)
+    unsat_pos = np.zeros(size * num_clauses + 1, dtype=np.int64)
+    ranks = np.arange(len(unsat)) - np.repeat(np.cumsum(num_unsat) - num_unsat, num_unsat)
+    unsat_list[unsat // num_clauses, ranks] = unsat
+    unsat_pos[unsat] = ranks
+    trivial = np.zeros(size, dtype=bool)
+    trivial[unsat[lengths[unsat] == 0] // num_clauses] = True
+    num_unsat[trivial] = 0
+    flips = np.zeros(size, dtype=np.int64)
 
-def walksat(clauses, num_variables, max_flips, p=0.5):
-    assignment = [random.choice([True, False]) for _ in range(num_variables + 1)]
-    
     for _ in range(max_flips):
-        unsatisfied = []
-        for clause in clauses:
-            clause_satisfied = False
-            for literal in clause:
-                var = abs(literal)
-                value = assignment[var] if literal > 0 else not assignment[var]
-                if value:
-                    clause_satisfied = True
-                    break
-            if not clause_satisfied:
-                unsatisfied.append(clause)
-        
-        if not unsatisfied:
-            return assignment[1:], 'SAT'
-        
-        clause = random.choice(unsatisfied)
-        
-        if random.random() < p:
-            literal = random.choice(list(clause))
-            var = abs(literal)
+        active = np.flatnonzero(num_unsat)
+        if not len(active):
+            break
+        rows = np.arange(len(active))
+        count = num_unsat[active]
+        clause = unsat_list[active, (rng.random(len(active)) * count).astype(np.int64)]
+        candidates = literals[clause]
+        clause_len = lengths[clause]
+        noisy = rng.random(len(active)) < p
+        random_pos = (rng.random(len(active)) * clause_len).astype(np.int64)
+        greedy = np.where(positions < clause_len[:, None], score[candidates], np.iinfo(np.int64).max).argmin(axis=1)
+        var = candidates[rows, np.where(noisy, random_pos, greedy)]
+        value = ~assignment[var]
+        assignment[var] = value
+        flips[active] += 1
+
+        occ = occ_clause[var]
+        now_true = occ_sign[var] == value[:, None]
+        delta = 2 * now_true - 1
+        old = true_count[occ]
+        new = old + delta
+        true_count[occ] = new
+        sums = true_sum[occ]
+        rest = sums + delta * var[:, None]
+        true_sum[occ] = rest
+
+        made_rows, made_cols = np.nonzero(old == 0)
+        broken_rows, broken_cols = np.nonzero(new == 0)
+        cleared, added = occ[made_rows, made_cols], occ[broken_rows, broken_cols]
+        made_count = np.bincount(made_rows, minlength=len(active))
+        broken_count = np.bincount(broken_rows, minlength=len(active))
+        score[var] += made_count - broken_count
+        np.add.at(score, sums[(old == 1) & now_true], -1)
+        np.add.at(score, rest[(new == 1) & ~now_true], 1)
+        np.add.at(score, literals[cleared], 1)
+        np.add.at(score, literals[added], -1)
+
+        appended = count[broken_rows] + np.arange(len(added)) - np.searchsorted(broken_rows, broken_rows)
+        unsat_list[active[broken_rows], appended] = added
+        unsat_pos[added] = appended
+        remaining = count + broken_count - made_count
+        holes = unsat_pos[cleared] < remaining[made_rows]
+        if holes.any():
+            span = slots[:made_count.max()]
+            tail = unsat_list[active[:, None], np.minimum(remaining[:, None] + span, num_clauses - 1)]
+            movers = (span < made_count[:, None]) & (true_count[tail] == 0)
+            moved = tail[movers]
+            target = unsat_pos[cleared[holes]]
+            unsat_list[active[np.nonzero(movers)[0]], target] = moved
+            unsat_pos[moved] = target
+        num_unsat[active] = remaining
+
+    results = []
+    for b in range(size):
+        if trivial[b]:
+            results.append((None, 'UNSAT', int(flips[b])))
+        elif not num_unsat[b]:
+            results.append((assignment[var_base[b] + 1:var_base[b] + stride].tolist(), 'SAT', int(flips[b])))
         else:
-            best_var = None
-            best_unsat_count = float('inf')
-            for literal in clause:
-                var = abs(literal)
-                assignment[var] = not assignment[var]
-                unsat_count = 0
-                for c in clauses:
-                    clause_satisfied = False
-                    for lit in c:
-                        v = abs(lit)
-                        value = assignment[v] if lit > 0 else not assignment[v]
-                        if value:
-                            clause_satisfied = True
-                            break
-                    if not clause_satisfied:
-                        unsat_count += 1
-                assignment[var] = not assignment[var]
-                
-                if unsat_count < best_unsat_count:
-                    best_unsat_count = unsat_count
-                    best_var = var
-            
-            var = best_var
-        
-        assignment[var] = not assignment[var]
-    
-    return None, 'UNSAT'
+            results.append((None, 'UNKNOWN', int(flips[b])))
+    return results
 
-def test_all_cnf_files(folder_path, output_csv, max_flips=10000, p=0.5):
+def test_all_cnf_files_batch(folder_path, output_csv, max_flips=10000, p=0.5, batch_size=64, restarts=1, seed=None):
+    write_header = not os.path.exists(output_csv)
+    sources = iter_sources(folder_path)
+    rng = random.Random(seed)
+
+    while True:
+        batch = []
+        for filename, data in sources:
+            cnf = parse_cnf(data)
+            batch.append((filename, cnf.clauses(), cnf.num_vars))
+            if len(batch) * restarts >= batch_size:
+                break
+        if not batch:
+            break
+
+        formulas = [clauses for _, clauses, _ in batch for _ in range(restarts)]
+        num_variables = max(n for _, _, n in batch)
+
+        start = time.perf_counter()
+        results = walksat_batch(formulas, num_variables, max_flips, p, rng.getrandbits(64))
+        elapsed = time.perf_counter() - start
+
+        total_flips = sum(flips for _, _, flips in results)
+        throughput = total_flips / elapsed if elapsed > 0 else 0.0
+
+        with open(output_csv, 'a', newline='') as csvfile:
+            writer = csv.writer(csvfile)
+            if write_header:
+                writer.writerow(["filename", "time_sec", "result", "flips", "batch_size", "flips_per_sec"])
+                write_header = False
+            for i, (filename, _, _) in enumerate(batch):
+                walkers = results[i * restarts:(i + 1) * restarts]
+                solved = [flips for _, result, flips in walkers if result == 'SAT']
+                result = 'SAT' if solved else walkers[0][1]
+                flips = min(solved) if solved else sum(flips for _, _, flips in walkers)
+                writer.writerow([filename, f"{elapsed:.4f}", result, flips, len(formulas), f"{throughput:.0f}"])
+                print(f"{filename}: {result} after {flips} flips")
+
+        print(f"Batch of {len(formulas)} walkers in {elapsed:.4f}s, {throughput:.0f} flips/s")
+
+def test_all_cnf_files(folder_path, output_csv, max_flips=10000, p=0.5, **options):
     write_header = not os.path.exists(output_csv)
     
-    for filename in os.listdir(folder_path):
-        if filename.endswith(".cnf"):
-            file_path = os.path.join(folder_path, filename)
-            print(f"Processing {filename}...")
+    for filename, data in iter_sources(folder_path):
+        print(f"Processing {filename}...")
+        
+        try:
+            cnf = parse_cnf(data)
+            clauses, num_variables = cnf.clauses(), cnf.num_vars
+            
+            tracemalloc.start()
+            start = time.perf_counter()
             
-            try:
-                clauses, num_variables = parse_cnf_file(file_path)
-                
-                tracemalloc.start()
-                start = time.perf_counter()
-                
-                _, result = walksat(clauses, num_variables, max_flips, p)
-                
-                elapsed = time.perf_counter() - start
-                current, peak = tracemalloc.get_traced_memory()
-                tracemalloc.stop()
-                
-                with open(output_csv, 'a', newline='') as csvfile:
-                    writer = csv.writer(csvfile)
-                    if write_header:
-                        writer.writerow(["filename", "time_sec", "peak_mem_kb", "result"])
-                        write_header = False
-                    writer.writerow([filename, f"{elapsed:.4f}", peak // 1024, result])
-                
-                print(f"{filename}: {result} in {elapsed:.4f}s, {peak // 1024} KB peak memory")
+            stats = {}
+            _, result = walksat(clauses, num_variables, max_flips, p, stats, **options)
+            
+            elapsed = time.perf_counter() - start
+            current, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            
+            with open(output_csv, 'a', newline='') as csvfile:
+                writer = csv.writer(csvfile)
+                if write_header:
+                    writer.writerow(["filename", "time_sec", "peak_mem_kb", "result"] + STAT_FIELDS)
+                    write_header = False
+                writer.writerow([filename, f"{elapsed:.4f}", peak // 1024, result] + [stats[key] for key in STAT_FIELDS])
+            
+            print(f"{filename}: {result} in {elapsed:.4f}s, {peak // 1024} KB peak memory")
+        
+        except Exception as e:
+            with open(output_csv, 'a', newline='') as csvfile:
+                writer = csv.writer(csvfile)
+                if write_header:
+                    writer.writerow(["filename", "time_sec", "peak_mem_kb", "result"] + STAT_FIELDS)
+                    write_header = False
+                writer.writerow([filename, "ERROR", "ERROR", f"ERROR: {e}"] + [""] * len(STAT_FIELDS))
             
-            except Exception as e:
-                with open(output_csv, 'a', newline='') as csvfile:
-                    writer = csv.writer(csvfile)
-                    if write_header:
-                        writer.writerow(["filename", "time_sec", "peak_mem_kb", "result"])
-                        write_header = False
-                    writer.writerow([filename, "ERROR", "ERROR", f"ERROR: {e}"])
-                
-                print(f"{filename}: ERROR - {e}")
+            print(f"{filename}: ERROR - {e}")
 
 if __name__ == "__main__":
     test_folder = "benchmarks"  
     output_file = "walksat_results.csv"  
-    max_flips = 10000
-    probability = 0.5
-    test_all_cnf_files(test_folder, output_file, max_flips, probability)
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Run WalkSAT-family local search over ./benchmarks.")
+    parser.add_argument("algorithm", nargs="?", default="walksat", choices=ALGORITHMS + ("batch",),
+                        help="search variant, or batch for the numpy WalkSAT walkers")
+    parser.add_argument("batch", nargs="*", type=int, metavar="N", help="batch mode: batch size and walkers per formula")
+    parser.add_argument("--max-flips", type=int, default=10000)
+    parser.add_argument("-p", "--noise", type=float, default=0.5, help="noise (starting noise is 0 with --adaptive)")
+    parser.add_argument("--adaptive", action="store_true", help="adapt the noise during search")
+    parser.add_argument("--restart", choices=RESTART_POLICIES, default="none")
+    parser.add_argument("--restart-base", type=int, default=1000, help="flips per restart unit")
+    parser.add_argument("--distribution", choices=tuple(DISTRIBUTIONS), default="poly", help="probSAT break weighting")
+    parser.add_argument("--cb", type=float, help="probSAT break base (default: per distribution)")
+    parser.add_argument("--eps", type=float, default=1.0, help="probSAT poly offset")
+    parser.add_argument("--wp", type=float, default=0.01, help="Novelty+ random walk probability")
+    parser.add_argument("--tabu", type=int, default=0, help="flips a flipped variable stays tabu for greedy moves")
+    parser.add_argument("--seed", type=int)
+    args = parser.parse_args()
+    if args.algorithm != "batch" and args.batch:
+        parser.error(f"batch size and walkers only apply to batch mode, not {args.algorithm}")
+    if len(args.batch) > 2:
+        parser.error("batch mode takes at most a batch size and walkers per formula")
+    if args.algorithm == "batch":
+        batch_size = args.batch[0] if args.batch else 64
+        restarts = args.batch[1] if len(args.batch) > 1 else 1
+        test_all_cnf_files_batch(test_folder, output_file, args.max_flips, args.noise, batch_size, restarts, args.seed)
+    else:
+        test_all_cnf_files(test_folder, output_file, args.max_flips, args.noise, algorithm=args.algorithm,
+                           seed=args.seed, restart=args.restart, restart_base=args.restart_base, adaptive=args.adaptive,
+                           distribution=args.distribution, cb=args.cb, eps=args.eps, wp=args.wp, tabu=args.tabu)
\ No newline at end of file
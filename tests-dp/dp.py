@@ -1,150 +1,226 @@
 
 import os
+import sys
 import time
 import tracemalloc
 import csv
-import re
-from itertools import product
-
-def parse_dimacs(file_content):
-    clauses = []
-    num_vars = 0
-    lines = file_content.strip().split('\n')
-    for line in lines:
-        line = line.strip()
-        if line.startswith(('c', '%')):
-            continue
-        if line.startswith('p'):
-            match = re.match(r'p\s+cnf\s+(\d+)\s+(\d+)', line)
-            if match:
-                num_vars = int(match.group(1))
-            continue
-        literals = []
-        for x in line.split():
-            try:
-                literal = int(x)
-                if literal != 0:
-                    literals.append(literal)
-            except ValueError:
-                continue
-        if literals:
-            clauses.append(literals)
-    return clauses, num_vars
-
-def unit_propagation(clauses, assignment):
-    while True:
-        unit_clause = None
-        literal = None
+import heapq
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'common'))
+import bitclause
+from dimacs import iter_sources, parse_cnf
+
+STAT_FIELDS = ["resolvents", "tautologies", "eliminated", "splits", "peak_clauses"]
+
+class Formula:
+    def __init__(self, clauses, stats=None, progress=None, progress_every=100, num_vars=0):
+        self.stats = stats if stats is not None else {}
+        for key in STAT_FIELDS:
+            self.stats.setdefault(key, 0)
+        self.progress = progress
+        self.progress_every = progress_every
+        self.clauses = {}
+        self.ids = {}
+        self.occurrences = {}
+        self.units = []
+        self.touched = set()
+        self.assignment = {}
+        self.eliminated = []
+        self.conflict = False
+        self.next_id = 0
+        self.num_vars = max(num_vars, getattr(clauses, "num_vars", 0))
         for clause in clauses:
-            unassigned = [lit for lit in clause if abs(lit) not in assignment]
-            if len(unassigned) == 0 and not any(assignment.get(abs(lit), False) == (lit > 0) for lit in clause):
-                return None, None
-            if len(unassigned) == 1:
-                unit_clause = clause
-                literal = unassigned[0]
+            clause = clause if isinstance(clause, tuple) else bitclause.from_literals(clause)
+            self.num_vars = max([self.num_vars] + [abs(lit) for lit in bitclause.to_literals(clause)])
+            self.add(clause)
+
+    def add(self, clause):
+        if bitclause.is_tautology(clause) or clause in self.ids:
+            return
+        if clause == bitclause.EMPTY:
+            self.conflict = True
+            return
+        clause_id = self.next_id
+        self.next_id += 1
+        self.clauses[clause_id] = clause
+        self.ids[clause] = clause_id
+        for lit in bitclause.to_literals(clause):
+            self.occurrences.setdefault(lit, set()).add(clause_id)
+            self.touched.add(abs(lit))
+        if bitclause.size(clause) == 1:
+            self.units.append(clause_id)
+        if len(self.clauses) > self.stats["peak_clauses"]:
+            self.stats["peak_clauses"] = len(self.clauses)
+
+    def remove(self, clause_id):
+        clause = self.clauses.pop(clause_id)
+        del self.ids[clause]
+        for lit in bitclause.to_literals(clause):
+            self.occurrences[lit].discard(clause_id)
+            self.touched.add(abs(lit))
+        return clause
+
+    def occurring(self, lit):
+        return self.occurrences.get(lit, ())
+
+    def assign(self, lit):
+        self.assignment[abs(lit)] = lit > 0
+        for clause_id in list(self.occurring(lit)):
+            self.remove(clause_id)
+        for clause_id in list(self.occurring(-lit)):
+            self.add(bitclause.without(self.remove(clause_id), -lit))
+
+    def propagate(self):
+        while self.units and not self.conflict:
+            clause_id = self.units.pop()
+            if clause_id in self.clauses:
+                self.assign(bitclause.to_literals(self.clauses[clause_id])[0])
+        return not self.conflict
+
+    def cost(self, var):
+        pos, neg = len(self.occurring(var)), len(self.occurring(-var))
+        return pos * neg - pos - neg
+
+    def resolvents(self, var, limit=None):
+        resolvents = set()
+        built = tautologies = 0
+        exceeded = False
+        for pos_id in self.occurring(var):
+            for neg_id in self.occurring(-var):
+                built += 1
+                resolvent = bitclause.resolve(self.clauses[pos_id], self.clauses[neg_id], var)
+                if bitclause.is_tautology(resolvent):
+                    tautologies += 1
+                    continue
+                resolvents.add(resolvent)
+                if limit is not None and len(resolvents) > limit:
+                    exceeded = True
+                    break
+            if exceeded:
                 break
-        if unit_clause is None:
-            break
-        assignment[abs(literal)] = literal > 0
-        clauses = [c for c in clauses if c != unit_clause]
-        clauses = [[lit for lit in clause if lit != -literal] for clause in clauses]
-        clauses = [clause for clause in clauses if literal not in clause]
-    return clauses, assignment
-
-def pure_literal_elimination(clauses, assignment):
-    literals = set()
-    for clause in clauses:
-        for lit in clause:
-            literals.add(lit)
-    pure_literals = [lit for lit in literals if -lit not in literals]
-    for lit in pure_literals:
-        assignment[abs(lit)] = lit > 0
-    clauses = [clause for clause in clauses if not any(lit in clause for lit in pure_literals)]
-    return clauses, assignment
-
-def resolution(clauses, var):
-    pos_clauses = [c for c in clauses if var in c]
-    neg_clauses = [c for c in clauses if -var in c]
-    other_clauses = [c for c in clauses if var not in c and -var not in c]
-    new_clauses = []
-    for pos, neg in product(pos_clauses, neg_clauses):
-        resolvent = [lit for lit in set(pos + neg) if lit != var and lit != -var]
-        if resolvent and not any(lit in resolvent and -lit in resolvent for lit in resolvent):
-            if resolvent not in new_clauses:
-                new_clauses.append(resolvent)
-    return other_clauses + new_clauses
-
-def davis_putnam(clauses, assignment=None):
-    if assignment is None:
-        assignment = {}
-
-    if not clauses:
-        return assignment
-    if any(not clause for clause in clauses):
-        return None
-
-    clauses, assignment = unit_propagation(clauses, assignment)
-    if clauses is None:
-        return None
-    if not clauses:
-        return assignment
+        self.stats["resolvents"] += built
+        self.stats["tautologies"] += tautologies
+        return None if exceeded else resolvents
+
+    def eliminate(self, var, resolvents):
+        removed = [self.remove(clause_id) for clause_id in list(self.occurring(var)) + list(self.occurring(-var))]
+        self.eliminated.append((var, removed))
+        for resolvent in resolvents:
+            self.add(resolvent)
+        self.stats["eliminated"] += 1
+        if self.progress is not None and self.stats["eliminated"] % self.progress_every == 0:
+            self.progress(dict(self.stats, clauses=len(self.clauses)))
+
+    def most_frequent_var(self):
+        counts = {}
+        for lit, ids in self.occurrences.items():
+            counts[abs(lit)] = counts.get(abs(lit), 0) + len(ids)
+        return max(counts, key=counts.get)
+
+    def extend_model(self, model):
+        eliminated = {var for var, _ in self.eliminated}
+        for var in range(1, self.num_vars + 1):
+            if var not in eliminated:
+                model.setdefault(var, False)
+        for var, removed in reversed(self.eliminated):
+            model[var] = False
+            for pos, neg in removed:
+                if pos >> var & 1 and not any(model.get(v, False) for v in bitclause.bits(pos & ~(1 << var))) \
+                        and not any(not model.get(v, False) for v in bitclause.bits(neg)):
+                    model[var] = True
+                    break
+        return model
+
+    def solve(self, bound=None):
+        queue = []
+        deferred = set()
+        while True:
+            if not self.propagate():
+                return None
+            if not self.clauses:
+                break
+            for var in self.touched:
+                if var not in self.assignment and (self.occurring(var) or self.occurring(-var)):
+                    deferred.discard(var)
+                    heapq.heappush(queue, (self.cost(var), var))
+            self.touched = set()
+            if not queue:
+                var = self.most_frequent_var()
+                for lit in (var, -var):
+                    self.stats["splits"] += 1
+                    branch = Formula(list(self.clauses.values()) + [bitclause.from_literals([lit])],
+                                     self.stats, self.progress, self.progress_every, self.num_vars)
+                    model = branch.solve(bound)
+                    if model is not None:
+                        return self.extend_model({**model, **self.assignment})
+                return None
+            cost, var = heapq.heappop(queue)
+            if var in self.assignment or var in deferred or not (self.occurring(var) or self.occurring(-var)):
+                continue
+            if cost != self.cost(var):
+                heapq.heappush(queue, (self.cost(var), var))
+                continue
+            limit = None if bound is None else len(self.occurring(var)) + len(self.occurring(-var)) + bound
+            resolvents = self.resolvents(var, limit)
+            if resolvents is None:
+                deferred.add(var)
+                continue
+            self.eliminate(var, resolvents)
+        return self.extend_model(dict(self.assignment))
 
-    clauses, assignment = pure_literal_elimination(clauses, assignment)
-    if not clauses:
-        return assignment
-    if any(not clause for clause in clauses):
+def davis_putnam(clauses, assignment=None, bound=None, stats=None, progress=None, progress_every=100):
+    model = Formula(clauses, stats, progress, progress_every).solve(bound)
+    if model is None:
         return None
-
-    literals = set(abs(lit) for clause in clauses for lit in clause)
-    if not literals:
+    if assignment is not None:
+        assignment.update(model)
         return assignment
-    var = min(literals)
-    clauses = resolution(clauses, var)
-    return davis_putnam(clauses, assignment)
+    return model
 
-def solve_dimacs(file_content):
-    clauses, num_vars = parse_dimacs(file_content)
-    assignment = davis_putnam(clauses)
+def solve_dimacs(file_content, bound=None, stats=None):
+    cnf = parse_cnf(file_content)
+    assignment = davis_putnam(cnf, bound=bound, stats=stats)
     return "UNSAT" if assignment is None else "SAT"
 
-def test_all_cnf_files(folder_path, output_csv):
+def test_all_cnf_files(folder_path, output_csv, bound=None):
     write_header = not os.path.exists(output_csv)
 
-    for filename in os.listdir(folder_path):
-        if filename.endswith(".cnf"):
-            file_path = os.path.join(folder_path, filename)
-            try:
-                with open(file_path, "r") as f:
-                    dimacs_input = f.read()
-
-                tracemalloc.start()
-                start = time.perf_counter()
-
-                result = solve_dimacs(dimacs_input)
-
-                elapsed = time.perf_counter() - start
-                current, peak = tracemalloc.get_traced_memory()
-                tracemalloc.stop()
-
-                with open(output_csv, 'a', newline='') as csvfile:
-                    writer = csv.writer(csvfile)
-                    if write_header:
-                        writer.writerow(["filename", "time_sec", "peak_mem_kb", "result"])
-                        write_header = False
-                    writer.writerow([filename, f"{elapsed:.4f}", peak // 1024, result])
-
-                print(f"{filename}: {result} in {elapsed:.4f}s, {peak // 1024} KB peak memory")
-
-            except Exception as e:
-                with open(output_csv, 'a', newline='') as csvfile:
-                    writer = csv.writer(csvfile)
-                    if write_header:
-                        writer.writerow(["filename", "time_sec", "peak_mem_kb", "result"])
-                        write_header = False
-                    writer.writerow([filename, "ERROR", "ERROR", f"ERROR: {e}"])
-                print(f"{filename}: ERROR - {e}")
+    for filename, dimacs_input in iter_sources(folder_path):
+        try:
+            tracemalloc.start()
+            start = time.perf_counter()
+
+            stats = {}
+            result = solve_dimacs(dimacs_input, bound, stats)
+
+            elapsed = time.perf_counter() - start
+            current, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+
+            with open(output_csv, 'a', newline='') as csvfile:
+                writer = csv.writer(csvfile)
+                if write_header:
+                    writer.writerow(["filename", "time_sec", "peak_mem_kb", "result", "bound"] + STAT_FIELDS)
+                    write_header = False
+                writer.writerow([filename, f"{elapsed:.4f}", peak // 1024, result, "" if bound is None else bound]
+                                + [stats[key] for key in STAT_FIELDS])
+
+            print(f"{filename}: {result} in {elapsed:.4f}s, {peak // 1024} KB peak memory")
+
+        except Exception as e:
+            with open(output_csv, 'a', newline='') as csvfile:
+                writer = csv.writer(csvfile)
+                if write_header:
+                    writer.writerow(["filename", "time_sec", "peak_mem_kb", "result", "bound"] + STAT_FIELDS)
+                    write_header = False
+                writer.writerow([filename, "ERROR", "ERROR", f"ERROR: {e}", "" if bound is None else bound]
+                                + [""] * len(STAT_FIELDS))
+            print(f"{filename}: ERROR - {e}")
 
 if __name__ == "__main__":
     folder = "benchmarks"        
     output_file = "dp_results.csv"
-    test_all_cnf_files(folder, output_file)
+    bound = 0
+    if len(sys.argv) > 1:
+        bound = None if sys.argv[1] == "none" else int(sys.argv[1])
+    test_all_cnf_files(folder, output_file, bound)
@@ -1,111 +1,183 @@
 import os
+import sys
 import time
+import heapq
 import tracemalloc
 import csv
 
-def parse_dimacs(dimacs_input):
-    clauses = []
-    variable_map = {}
-    reverse_map = {}
-    next_id = 1
-
-    for line in dimacs_input.split('\n'):
-        line = line.strip()
-        if not line or line.startswith(('c', '%')):
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'common'))
+import bitclause
+from dimacs import iter_sources, parse_cnf
+
+STRATEGIES = ('fifo', 'unit', 'sos', 'ordered')
+STAT_FIELDS = ["resolvents", "tautologies", "given", "peak_clauses"]
+
+def parse_strategy(strategy):
+    options = set(strategy.split('+'))
+    unknown = options - set(STRATEGIES)
+    if unknown:
+        raise ValueError(f"Unknown resolution strategy '{'+'.join(sorted(unknown))}'")
+    if 'fifo' in options and 'unit' in options:
+        raise ValueError("Choose either 'fifo' or 'unit' clause selection")
+    if 'sos' in options and 'ordered' in options:
+        raise ValueError("Ordered resolution is incomplete together with set of support")
+    return options
+
+class ClauseIndex:
+    def __init__(self):
+        self.clauses = {}
+        self.occurrences = {}
+
+    def add(self, clause_id, clause):
+        self.clauses[clause_id] = clause
+        for lit in bitclause.to_literals(clause):
+            self.occurrences.setdefault(lit, set()).add(clause_id)
+
+    def remove(self, clause_id):
+        clause = self.clauses.pop(clause_id)
+        for lit in bitclause.to_literals(clause):
+            self.occurrences[lit].discard(clause_id)
+
+    def subsumes(self, clause):
+        for lit in bitclause.to_literals(clause):
+            for clause_id in self.occurrences.get(lit, ()):
+                if bitclause.subsumes(self.clauses[clause_id], clause):
+                    return True
+        return False
+
+    def subsumed_by(self, clause):
+        lists = sorted((self.occurrences.get(lit, set()) for lit in bitclause.to_literals(clause)), key=len)
+        if not lists:
+            return []
+        candidates = lists[0].intersection(*lists[1:])
+        return [clause_id for clause_id in candidates if bitclause.subsumes(clause, self.clauses[clause_id])]
+
+    def partners(self, lit):
+        return [(clause_id, self.clauses[clause_id]) for clause_id in self.occurrences.get(-lit, ())]
+
+def resolution(dimacs_input, strategy='unit', stats=None):
+    return saturate(parse_cnf(dimacs_input), strategy, stats)
+
+def saturate(int_clauses, strategy='unit', stats=None, progress=None, progress_every=1000):
+    options = parse_strategy(strategy)
+    unit_preference = 'fifo' not in options
+    ordered = 'ordered' in options
+
+    processed = ClauseIndex()
+    unprocessed = []
+    seen = set()
+    age = 0
+    resolvents = tautologies = given_count = peak = 0
+    next_progress = progress_every if progress is not None else -1
+
+    def record(result):
+        if stats is not None:
+            stats.update(resolvents=resolvents, tautologies=tautologies, given=given_count,
+                         peak_clauses=max(peak, len(processed.clauses) + len(unprocessed)))
+        return result
+
+    def push(clause):
+        nonlocal age
+        heapq.heappush(unprocessed, ((bitclause.size(clause) if unit_preference else 0), age, clause))
+        age += 1
+
+    for literals in int_clauses:
+        clause = bitclause.from_literals(literals)
+        if clause == bitclause.EMPTY:
+            return record(False)
+        if bitclause.is_tautology(clause):
+            tautologies += 1
+            continue
+        if clause in seen:
             continue
-        if line.startswith('p'):
+        seen.add(clause)
+        if 'sos' in options and clause[0]:
+            if not processed.subsumes(clause):
+                for clause_id in processed.subsumed_by(clause):
+                    processed.remove(clause_id)
+                processed.add(age, clause)
+                age += 1
+        else:
+            push(clause)
+
+    while unprocessed:
+        size = len(processed.clauses) + len(unprocessed)
+        if size > peak:
+            peak = size
+        _, given_id, given = heapq.heappop(unprocessed)
+        if processed.subsumes(given):
             continue
-        literals = []
-        for x in line.split():
-            try:
-                literal = int(x)
-                if literal != 0:
-                    literals.append(literal)
-            except ValueError:
-                continue
-        clause = set()
-        for lit in literals:
+        given_count += 1
+        if given_count == next_progress:
+            next_progress += progress_every
+            progress({"resolvents": resolvents, "tautologies": tautologies, "given": given_count,
+                      "processed": len(processed.clauses), "unprocessed": len(unprocessed)})
+        for clause_id in processed.subsumed_by(given):
+            processed.remove(clause_id)
+        processed.add(given_id, given)
+
+        if ordered:
+            top = bitclause.max_var(given)
+            pivots = [top if given[0] >> top & 1 else -top]
+        else:
+            pivots = bitclause.to_literals(given)
+        for lit in pivots:
             var = abs(lit)
-            if var not in variable_map:
-                variable_map[var] = f'x{next_id}'
-                reverse_map[f'x{next_id}'] = var
-                next_id += 1
-            var_name = variable_map[var]
-            literal = var_name if lit > 0 else f'-{var_name}'
-            clause.add(literal)
-        clauses.append(frozenset(clause))
-    return clauses, variable_map, reverse_map
-
-def resolve(clause1, clause2):
-    for literal in clause1:
-        negation = ('-' + literal) if literal[0] != '-' else literal[1:]
-        if negation in clause2:
-            resolvent = (clause1 - {literal}) | (clause2 - {negation})
-            return frozenset(resolvent)
-    return None
-
-def resolution(dimacs_input):
-    clauses, variable_map, reverse_map = parse_dimacs(dimacs_input)
-    new = set()
-
-    while True:
-        pairs = [(clauses[i], clauses[j]) for i in range(len(clauses)) for j in range(i + 1, len(clauses))]
-        for (ci, cj) in pairs:
-            resolvent = resolve(ci, cj)
-            if resolvent is not None:
-                if not resolvent:
-                    return False  
-                new.add(resolvent)
-
-        if not new:
-            return True  
-
-        new_clauses = set(clauses) | new
-        if new_clauses == set(clauses):
-            return True 
-
-        clauses = list(new_clauses)
-        new = set()
-
-def test_all_cnf_files(folder_path, output_csv):
+            for clause_id, other in processed.partners(lit):
+                if ordered and bitclause.max_var(other) != var:
+                    continue
+                resolvent = bitclause.resolve(given, other, var)
+                resolvents += 1
+                if resolvent == bitclause.EMPTY:
+                    return record(False)
+                if bitclause.is_tautology(resolvent):
+                    tautologies += 1
+                    continue
+                if resolvent in seen:
+                    continue
+                seen.add(resolvent)
+                if not processed.subsumes(resolvent):
+                    push(resolvent)
+
+    return record(True)
+
+def test_all_cnf_files(folder_path, output_csv, strategy='unit'):
     write_header = not os.path.exists(output_csv)
 
-    for filename in os.listdir(folder_path):
-        if filename.endswith(".cnf"):
-            file_path = os.path.join(folder_path, filename)
-            try:
-                with open(file_path, "r") as f:
-                    dimacs_input = f.read()
-
-                tracemalloc.start()
-                start = time.perf_counter()
+    for filename, dimacs_input in iter_sources(folder_path):
+        try:
+            tracemalloc.start()
+            start = time.perf_counter()
 
-                result = resolution(dimacs_input)
+            stats = {}
+            result = resolution(dimacs_input, strategy, stats)
 
-                elapsed = time.perf_counter() - start
-                current, peak = tracemalloc.get_traced_memory()
-                tracemalloc.stop()
+            elapsed = time.perf_counter() - start
+            current, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
 
-                with open(output_csv, 'a', newline='') as csvfile:
-                    writer = csv.writer(csvfile)
-                    if write_header:
-                        writer.writerow(["filename", "time_sec", "peak_mem_kb", "result"])
-                        write_header = False
-                    writer.writerow([filename, f"{elapsed:.4f}", peak // 1024, "UNSAT" if result is False else "SAT"])
+            with open(output_csv, 'a', newline='') as csvfile:
+                writer = csv.writer(csvfile)
+                if write_header:
+                    writer.writerow(["filename", "time_sec", "peak_mem_kb", "result", "strategy"] + STAT_FIELDS)
+                    write_header = False
+                writer.writerow([filename, f"{elapsed:.4f}", peak // 1024, "UNSAT" if result is False else "SAT", strategy]
+                                + [stats[key] for key in STAT_FIELDS])
 
-                print(f"{filename}: {'UNSAT' if result is False else 'SAT'} in {elapsed:.4f}s, {peak // 1024} KB peak memory")
+            print(f"{filename}: {'UNSAT' if result is False else 'SAT'} in {elapsed:.4f}s, {peak // 1024} KB peak memory")
 
-            except Exception as e:
-                with open(output_csv, 'a', newline='') as csvfile:
-                    writer = csv.writer(csvfile)
-                    if write_header:
-                        writer.writerow(["filename", "time_sec", "peak_mem_kb", "result"])
-                        write_header = False
-                    writer.writerow([filename, "ERROR", "ERROR", f"ERROR: {e}"])
+        except Exception as e:
+            with open(output_csv, 'a', newline='') as csvfile:
+                writer = csv.writer(csvfile)
+                if write_header:
+                    writer.writerow(["filename", "time_sec", "peak_mem_kb", "result", "strategy"] + STAT_FIELDS)
+                    write_header = False
+                writer.writerow([filename, "ERROR", "ERROR", f"ERROR: {e}", strategy] + [""] * len(STAT_FIELDS))
 
-                print(f"{filename}: ERROR - {e}")
+            print(f"{filename}: ERROR - {e}")
 
 if __name__ == "__main__":
     test_folder = "benchmarks"  
     output_file = "resolution_results.csv" 
-    test_all_cnf_files(test_folder, output_file)
+    strategy = sys.argv[1] if len(sys.argv) > 1 else 'unit'
+    test_all_cnf_files(test_folder, output_file, strategy)